@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,10 +39,13 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compresses /api/ responses; keep above middleware reading the body.
+    'api.middleware.APICompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,6 +84,10 @@ DATABASES = {
     }
 }
 
+# No CACHES: the default is a per-process LocMemCache, with which the
+# BookListView query cache stays off (see api.versioning.is_shared). Deploy
+# with a cache shared by every worker (Redis, Memcached) to enable it.
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -121,3 +129,14 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+REST_FRAMEWORK = {
+    # Compact renderers clients can opt into with Accept (see api.renderers);
+    # MessagePack needs the optional msgpack package.
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ColumnarJSONRenderer',
+        *(['api.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
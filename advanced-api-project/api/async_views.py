@@ -0,0 +1,239 @@
+"""
+Async-native read endpoints for books and authors.
+
+DRF views are synchronous, so under ASGI each request holds a worker thread
+for its whole duration. These views are plain Django async views: the
+filtering, ordering and pagination configuration is taken from the matching
+DRF view (the filter backends only build querysets), the rows are read with
+the async ORM (``acount``, ``aget``, ``aiterator``) and shaped by the
+``api.fastpath`` row builders, and the result is rendered by the renderer
+the DRF view would negotiate from ``Accept``/``?format=``, so bodies are
+identical to the synchronous endpoints. Facet counts (``?facets=``) are
+built by the DRF view in a worker thread.
+
+Conditional GETs are supported too, with ETags of their own (they depend
+on the URL): the fingerprint aggregate runs with ``aaggregate()`` and is
+not taken from the query cache (see ``api.querycache``).
+
+Only GET is supported; writes stay on the DRF views, and the browsable API
+is not offered (``?format=api`` is answered like an unknown format, with
+a 404).
+"""
+import math
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework.exceptions import NotAcceptable, NotFound, ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .conditional import ConditionalGetMixin
+from .fastpath import get_row_builder
+from .models import Author, Book
+from .serializers import BookSerializer
+from .views import AuthorDetailView, AuthorListView, BookDetailView, BookListView
+
+
+async def arows(queryset, *fields):
+    """
+    Yield ``queryset.values_list(*fields)`` rows asynchronously.
+
+    ``values_list()`` runs its query as soon as it is iterated, which the
+    async iterator does outside the thread it hands to the ORM; ``values()``
+    rows are fetched lazily, so they are read there and turned into tuples.
+    """
+    as_tuple = itemgetter(*fields)
+    async for row in queryset.values(*fields).aiterator():
+        yield as_tuple(row) if len(fields) > 1 else (row[fields[0]],)
+
+
+class AsyncAPIView(View):
+    """Base class: a DRF view class supplies the configuration."""
+    view_class = None
+    http_method_names = ['get', 'head', 'options']
+    # Errors found before a renderer is negotiated, as DRF does.
+    renderer = JSONRenderer()
+
+    def get_drf_view(self, request, **kwargs):
+        return self.view_class(request=Request(request), kwargs=kwargs, format_kwarg=None)
+
+    def negotiate(self, view):
+        """Select the renderer the DRF view would, leaving out the browsable API."""
+        renderers = [renderer for renderer in view.get_renderers() if not isinstance(renderer, BrowsableAPIRenderer)]
+        try:
+            renderer, media_type = view.get_content_negotiator().select_renderer(view.request, renderers)
+        except Http404:
+            # An unknown ?format=, which DRF's exception handler turns into a NotFound.
+            raise NotFound()
+        view.request.accepted_renderer, view.request.accepted_media_type = renderer, media_type
+        self.renderer = renderer
+
+    def render(self, data, status=200):
+        renderer = self.renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = '%s; charset=%s' % (content_type, renderer.charset)
+        return HttpResponse(renderer.render(data), status=status, content_type=content_type)
+
+    async def get_fingerprint(self, view):
+        """ConditionalGetMixin.get_fingerprint(), with the async ORM."""
+        queryset = view.get_fingerprint_queryset().order_by()
+        return await queryset.aaggregate(**view.get_fingerprint_aggregates())
+
+    async def get(self, request, **kwargs):
+        view = self.get_drf_view(request, **kwargs)
+        try:
+            self.negotiate(view)
+            if not isinstance(view, ConditionalGetMixin):
+                return self.render(await self.get_data(view))
+
+            fingerprint = await self.get_fingerprint(view)
+            etag = view.get_etag(fingerprint)
+            last_modified = view.get_last_modified(fingerprint)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = self.render(await self.get_data(view))
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            return response
+        except NotAcceptable as exc:
+            return self.render({'detail': exc.detail}, status=406)
+        except NotFound as exc:
+            return self.render({'detail': exc.detail}, status=404)
+        except ValidationError as exc:
+            return self.render(exc.detail, status=400)
+
+    async def get_data(self, view):
+        raise NotImplementedError
+
+
+class AsyncPageMixin:
+    """PageNumberPagination, computed with ``acount()`` and a sliced ``aiterator()``."""
+
+    async def paginate(self, view, queryset, columns, build):
+        paginator = view.paginator
+        request = view.request
+        page_size = paginator.get_page_size(request)
+        count = await queryset.acount()
+        num_pages = max(1, math.ceil(count / page_size))
+
+        page_number = request.query_params.get(paginator.page_query_param) or 1
+        if page_number in paginator.last_page_strings:
+            page_number = num_pages
+        try:
+            page_number = int(page_number)
+        except (TypeError, ValueError):
+            raise NotFound(paginator.invalid_page_message.format(
+                page_number=page_number, message='That page number is not an integer'))
+        if not 1 <= page_number <= num_pages:
+            raise NotFound(paginator.invalid_page_message.format(
+                page_number=page_number, message='That page contains no results'))
+
+        offset = (page_number - 1) * page_size
+        results = [build(row) async for row in arows(queryset[offset:offset + page_size], *columns)]
+
+        url = request.build_absolute_uri()
+        next_link = previous_link = None
+        if page_number < num_pages:
+            next_link = replace_query_param(url, paginator.page_query_param, page_number + 1)
+        if page_number == 2:
+            previous_link = remove_query_param(url, paginator.page_query_param)
+        elif page_number > 2:
+            previous_link = replace_query_param(url, paginator.page_query_param, page_number - 1)
+        return {'count': count, 'next': next_link, 'previous': previous_link, 'results': results}
+
+
+class AsyncBookListView(AsyncPageMixin, AsyncAPIView):
+    """Async BookListView: same filters, search, ordering, pages and facets."""
+    view_class = BookListView
+
+    async def get_data(self, view):
+        facets = view.get_facets()
+        builder = view.get_serializer_row_builder()
+        queryset = view.filter_queryset(view.get_queryset())
+        data = await self.paginate(view, queryset, builder.columns, builder.build)
+        if facets:
+            data['facets'] = await sync_to_async(view.build_facets)(facets, queryset)
+        return data
+
+
+class AsyncBookDetailView(AsyncAPIView):
+    """Async BookDetailView."""
+    view_class = BookDetailView
+
+    async def get_data(self, view):
+        builder = view.get_serializer_row_builder()
+        try:
+            row = await view.get_queryset().values_list(*builder.columns).aget(pk=view.kwargs['pk'])
+        except Book.DoesNotExist:
+            raise NotFound('No Book matches the given query.')
+        return builder.build(row)
+
+
+class AsyncAuthorMixin:
+    """
+    Serializes authors with their books in each ``?books=`` mode, narrowed
+    by ``?fields=``/``?omit=``.
+    """
+
+    async def serialize_authors(self, view, authors):
+        selected = view.get_selected_fields()
+        if not authors.ordered:
+            # A table scan returns primary key order; a covering index on
+            # ``name`` would not, so make the order the sync view gets explicit.
+            authors = authors.order_by('pk')
+        if selected is not None and 'books' not in selected:
+            data = [{'id': pk, 'name': name} async for pk, name in arows(authors, 'id', 'name')]
+        else:
+            data = await self.serialize_authors_with_books(view, authors)
+        if selected is not None:
+            data = [{name: author[name] for name in selected} for author in data]
+        return data
+
+    async def serialize_authors_with_books(self, view, authors):
+        mode = view.get_books_mode()
+        if mode == 'count':
+            rows = arows(authors.annotate(book_count=Count('books')), 'id', 'name', 'book_count')
+            return [{'id': pk, 'name': name, 'books': count} async for pk, name, count in rows]
+
+        data = [
+            {'id': pk, 'name': name, 'books': []}
+            async for pk, name in arows(authors, 'id', 'name')
+        ]
+        by_author = {author['id']: author['books'] for author in data}
+        books = Book.objects.filter(author__in=authors.values('pk')).order_by('pk')
+        if mode == 'ids':
+            async for pk, author_id in arows(books, 'pk', 'author_id'):
+                by_author[author_id].append(pk)
+        else:
+            builder = get_row_builder(BookSerializer)
+            author_index = builder.columns.index('author_id')
+            async for row in arows(books, *builder.columns):
+                by_author[row[author_index]].append(builder.build(row))
+        return data
+
+
+class AsyncAuthorListView(AsyncAuthorMixin, AsyncAPIView):
+    """Async AuthorListView (reads only)."""
+    view_class = AuthorListView
+
+    async def get_data(self, view):
+        return await self.serialize_authors(view, view.filter_queryset(Author.objects.all()))
+
+
+class AsyncAuthorDetailView(AsyncAuthorMixin, AsyncAPIView):
+    """Async AuthorDetailView (reads only)."""
+    view_class = AuthorDetailView
+
+    async def get_data(self, view):
+        authors = await self.serialize_authors(view, Author.objects.filter(pk=view.kwargs['pk']))
+        if not authors:
+            raise NotFound('No Author matches the given query.')
+        return authors[0]
@@ -0,0 +1,277 @@
+"""
+Latency / query-count benchmarks for the api endpoints.
+
+Each ``Scenario`` is one request against a URL of ``api.urls``; ``measure()``
+issues it repeatedly through the Django test client and records the latency
+distribution, the number of SQL queries and the size of the response body.
+The main numbers are cold: the list query cache (see ``api.querycache``) is
+cleared before every measured request. The ``warm_*`` numbers repeat the
+request with the cache left in place; they only differ when the cache
+backend is shared, as the query cache is off otherwise.
+The ``benchmark_api`` management command seeds a throwaway database with
+``api.factories`` and writes the results of every scenario to JSON, so runs
+on different commits can be compared with ``compare()``.
+
+``fast_path_speedup()`` additionally times ``BookSerializer`` against the
+``api.fastpath`` row builder on pages of increasing size, and
+``search_speedup()`` times DRF's ``icontains`` SearchFilter against the
+``api.search`` trigram index (run with ``--books 1000000`` for the large
+catalogue numbers). ``renderer_sizes()`` compares the body size and render
+time of the ``api.renderers`` layouts with ``JSONRenderer`` on 10k rows.
+"""
+import math
+import time
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.text import compress_string
+from rest_framework import filters
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import middleware, renderers
+from .fastpath import get_row_builder
+from .models import Author, Book
+from .search import RankedOrderingFilter, TrigramSearchFilter
+from .serializers import BookSerializer
+
+
+class Scenario:
+    """
+    A named GET request. ``lookup`` is the model whose middle row's pk is
+    passed to detail URLs, so detail scenarios don't depend on seeded ids.
+    """
+
+    def __init__(self, name, url_name, params=None, lookup=None, kwargs=None):
+        self.name = name
+        self.url_name = url_name
+        self.params = params or {}
+        self.lookup = lookup
+        self.kwargs = kwargs or {}
+
+    def url(self):
+        kwargs = dict(self.kwargs)
+        if self.lookup is not None:
+            pks = self.lookup.objects.order_by('pk').values_list('pk', flat=True)
+            kwargs['pk'] = pks[pks.count() // 2]
+        url = reverse(self.url_name, kwargs=kwargs)
+        if self.params:
+            url += '?' + urlencode(self.params)
+        return url
+
+
+SCENARIOS = [
+    Scenario('book-list', 'book-list'),
+    Scenario('book-list-filter-year', 'book-list', {'publication_year': 1984}),
+    Scenario('book-list-filter-author', 'book-list', {'author__name': 'Ada Achebe 0'}),
+    Scenario('book-list-search', 'book-list', {'search': 'Winter'}),
+    Scenario('book-list-order-year', 'book-list', {'ordering': '-publication_year'}),
+    Scenario('book-list-page-1000', 'book-list', {'page_size': 1000}),
+    Scenario('book-list-search-order', 'book-list', {'search': 'Storm', 'ordering': 'publication_year'}),
+    Scenario('book-list-facets', 'book-list', {'facets': 'author,publication_year'}),
+    Scenario('book-list-search-facets', 'book-list', {'search': 'Winter', 'facets': 'author,publication_year'}),
+    Scenario('book-list-fields', 'book-list', {'fields': 'id,title'}),
+    Scenario('book-detail', 'book-detail', lookup=Book),
+    Scenario('book-stats', 'book-stats'),
+    Scenario('book-stats-filter-year', 'book-stats', {'publication_year': 1984}),
+    Scenario('book-stats-search', 'book-stats', {'search': 'Winter'}),
+    Scenario('book-export-ndjson', 'book-export', kwargs={'export_format': 'ndjson'}),
+    Scenario('book-export-csv', 'book-export', kwargs={'export_format': 'csv'}),
+    Scenario('author-list', 'author-list'),
+    Scenario('author-list-search', 'author-list', {'search': 'Murakami'}),
+    Scenario('author-list-book-ids', 'author-list', {'books': 'ids'}),
+    Scenario('author-list-book-count', 'author-list', {'books': 'count'}),
+    Scenario('author-list-omit-books', 'author-list', {'omit': 'books'}),
+    Scenario('author-detail', 'author-detail', lookup=Author),
+]
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list of numbers."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def clear_query_caches():
+    from .views import BookListView
+
+    BookListView.query_cache.clear()
+
+
+def _timed_requests(client, url, iterations, before=None):
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        if before is not None:
+            before()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(url)
+            size = _body_size(response)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+    return response, size, timings, queries
+
+
+def measure(scenario, iterations=20, warmup=1, client=None):
+    """Run one scenario; return its summary as a JSON-serializable dict."""
+    client = client or Client()
+    url = scenario.url()
+    for _ in range(warmup):
+        _body_size(client.get(url))
+
+    response, size, timings, queries = _timed_requests(client, url, iterations, before=clear_query_caches)
+    _, _, warm_timings, warm_queries = _timed_requests(client, url, iterations)
+    return {
+        'url': url,
+        'status': response.status_code,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'queries': max(queries),
+        'bytes': size,
+        'warm_p50_ms': round(percentile(warm_timings, 50), 3),
+        'warm_p99_ms': round(percentile(warm_timings, 99), 3),
+        'warm_queries': max(warm_queries),
+    }
+
+
+def run(scenarios=None, iterations=20, warmup=1):
+    """Measure every scenario; return ``{name: summary}``."""
+    client = Client()
+    return {
+        scenario.name: measure(scenario, iterations=iterations, warmup=warmup, client=client)
+        for scenario in (SCENARIOS if scenarios is None else scenarios)
+    }
+
+
+def _time(function, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50)
+
+
+def fast_path_speedup(page_sizes=(100, 250, 500, 1000), iterations=20):
+    """
+    Time fetching and rendering one page of books through BookSerializer and
+    through its row builder. Returns ``{page_size: summary}``.
+    """
+    builder = get_row_builder(BookSerializer)
+    renderer = JSONRenderer()
+    books = Book.objects.order_by('title')
+    results = {}
+    for size in page_sizes:
+        serializer_ms = _time(
+            lambda: renderer.render(BookSerializer(books[:size], many=True).data), iterations,
+        )
+        fast_path_ms = _time(
+            lambda: renderer.render(builder.build_many(books.values_list(*builder.columns)[:size])),
+            iterations,
+        )
+        results[str(size)] = {
+            'serializer_p50_ms': round(serializer_ms, 3),
+            'fast_path_p50_ms': round(fast_path_ms, 3),
+            'speedup': round(serializer_ms / fast_path_ms, 2),
+        }
+    return results
+
+
+def search_speedup(terms=('winter', 'murakami', 'zumi', 'kashiro'), iterations=5, page_size=100):
+    """
+    Time one BookListView search (COUNT plus the first page) with
+    SearchFilter and with TrigramSearchFilter. Returns ``{term: summary}``.
+    """
+    from .views import BookListView
+
+    factory = APIRequestFactory()
+    results = {}
+    for term in terms:
+        request = Request(factory.get('/', {'search': term}))
+        view = BookListView(request=request, kwargs={}, format_kwarg=None)
+
+        def run_search(search_filter, ordering_filter):
+            queryset = search_filter.filter_queryset(request, Book.objects.all(), view)
+            queryset = ordering_filter.filter_queryset(request, queryset, view)
+            list(queryset.values_list('pk', flat=True)[:page_size])
+            return queryset.count()
+
+        icontains = (filters.SearchFilter(), filters.OrderingFilter())
+        trigram = (TrigramSearchFilter(), RankedOrderingFilter())
+        icontains_ms = _time(lambda: run_search(*icontains), iterations)
+        trigram_ms = _time(lambda: run_search(*trigram), iterations)
+        results[term] = {
+            'icontains_p50_ms': round(icontains_ms, 3),
+            'trigram_p50_ms': round(trigram_ms, 3),
+            'speedup': round(icontains_ms / trigram_ms, 2),
+            'icontains_matches': run_search(*icontains),
+            'trigram_matches': run_search(*trigram),
+        }
+    return results
+
+
+def renderer_sizes(rows=10000, iterations=5):
+    """
+    Render ``rows`` books, as a flat page and nested in their authors, with
+    each renderer; record body size, render time and the compressed sizes.
+    Returns ``{payload: {renderer: summary}}``.
+    """
+    builder = get_row_builder(BookSerializer)
+    books = builder.build_many(Book.objects.order_by('pk').values_list(*builder.columns)[:rows])
+    by_author = {}
+    for book in books:
+        by_author.setdefault(book['author'], []).append(book)
+    names = dict(Author.objects.filter(pk__in=by_author).values_list('pk', 'name'))
+    payloads = {
+        'book-page': {'count': len(books), 'next': None, 'previous': None, 'results': books},
+        'authors-nested': [
+            {'id': pk, 'name': names[pk], 'books': author_books} for pk, author_books in by_author.items()
+        ],
+    }
+    candidates = {'json': JSONRenderer(), 'columnar': renderers.ColumnarJSONRenderer()}
+    if renderers.msgpack is not None:
+        candidates['msgpack'] = renderers.MessagePackRenderer()
+
+    results = {}
+    for payload_name, data in payloads.items():
+        results[payload_name] = {}
+        for name, renderer in candidates.items():
+            body = renderer.render(data)
+            summary = {
+                'render_p50_ms': round(_time(lambda: renderer.render(data), iterations), 3),
+                'bytes': len(body),
+                'gzip_bytes': len(compress_string(body)),
+            }
+            if middleware.brotli is not None:
+                quality = middleware.APICompressionMiddleware.brotli_quality
+                summary['brotli_bytes'] = len(middleware.brotli.compress(body, quality=quality))
+            results[payload_name][name] = summary
+    return results
+
+
+def compare(baseline, current, metrics=('p50_ms', 'p99_ms', 'queries', 'bytes')):
+    """
+    Yield ``(scenario, metric, before, after, ratio)`` for the scenarios
+    present in both result sets; ``ratio`` is None when ``before`` is zero.
+    """
+    for name, after in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in metrics:
+            old, new = before[metric], after[metric]
+            yield name, metric, old, new, (new / old if old else None)
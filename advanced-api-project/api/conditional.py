@@ -0,0 +1,89 @@
+"""
+ETag / Last-Modified support for read endpoints.
+
+Instead of hashing a rendered body, ``ConditionalGetMixin`` fingerprints the
+rows a response is built from with one aggregate query (row count plus
+latest ``updated_at``) and answers ``If-None-Match`` / ``If-Modified-Since``
+with a 304 before anything is loaded or serialized.
+
+The count catches deletions, the latest ``updated_at`` catches inserts and
+updates. Writes that bypass ``save()`` (``QuerySet.update()``,
+``bulk_update()``) must set ``updated_at`` themselves.
+
+Only the ETag sees the count. ``Last-Modified`` is therefore sent for
+single objects alone: deleting a row from a list (or one of the books
+nested in an author) leaves ``MAX(updated_at)`` where it was, and an
+``If-Modified-Since`` check would answer 304 for the stale response.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    GenericAPIView mixin adding ETag (and, for single objects,
+    Last-Modified) headers to GET responses and answering conditional
+    requests with 304 Not Modified.
+
+    List views fingerprint their filtered queryset, detail views the one
+    object named in the URL. Views whose responses include related rows
+    extend ``get_fingerprint_aggregates()``.
+    """
+
+    def get_fingerprint_aggregates(self):
+        """Aggregates summarizing the rows a response is built from."""
+        return {
+            'count': Count('pk', distinct=True),
+            'updated_at': Max('updated_at'),
+        }
+
+    def is_detail_request(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_fingerprint_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_detail_request():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_fingerprint(self):
+        """Return the fingerprint aggregates of this request as a dict."""
+        return self.get_fingerprint_queryset().order_by().aggregate(**self.get_fingerprint_aggregates())
+
+    def get_last_modified(self, fingerprint):
+        # Deletions don't move a MAX(updated_at): only an object fingerprinted
+        # on its own row has a trustworthy modification time.
+        if not self.is_detail_request() or set(fingerprint) != {'count', 'updated_at'}:
+            return None
+        if fingerprint['updated_at'] is not None:
+            return timegm(fingerprint['updated_at'].utctimetuple())
+
+    def get_etag(self, fingerprint):
+        # Anything else the body depends on: the view, the query string
+        # (filters, ordering, page, expansion modes) and the renderer.
+        parts = [
+            type(self).__name__,
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+        ]
+        parts.extend('%s=%s' % item for item in sorted(fingerprint.items()))
+        return quote_etag(hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        fingerprint = self.get_fingerprint()
+        etag = self.get_etag(fingerprint)
+        last_modified = self.get_last_modified(fingerprint)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
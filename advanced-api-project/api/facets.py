@@ -0,0 +1,86 @@
+"""
+Facet counts next to list pages.
+
+With ``?facets=author,publication_year`` the paginated envelope gains a
+``facets`` object with, per requested facet, the number of books matching
+the current filters for each author or year. Facets are grouped queries,
+over the materialized rollups when the filters allow it (see
+``api.rollups``), otherwise over the filtered books. Each one is ordered
+and cut to ``facet_limit`` rows by the database; they are combined in one
+``UNION ALL`` where the backend allows sliced parts in compound queries
+(SQLite doesn't, so there each facet is a query of its own).
+"""
+from itertools import chain
+
+from django.db import connections
+from django.db.models import CharField, Max, Value
+from rest_framework.exceptions import ValidationError
+
+from . import rollups
+
+
+class FacetMixin:
+    """
+    ListAPIView mixin adding the facet counts requested with ``?facets=``
+    to the paginated response. Each facet lists its ``facet_limit`` most
+    frequent values, most frequent first.
+    """
+    facet_query_param = 'facets'
+    facet_names = ('author', 'publication_year')
+    facet_limit = 100
+
+    def get_facets(self):
+        value = self.request.query_params.get(self.facet_query_param, '')
+        facets = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in facets if name not in self.facet_names]
+        if unknown:
+            raise ValidationError({
+                self.facet_query_param: 'Must be a comma separated list of: %s.' % ', '.join(self.facet_names),
+            })
+        return facets
+
+    def get_fingerprint_aggregates(self):
+        aggregates = super().get_fingerprint_aggregates()
+        if 'author' in self.get_facets():
+            # Author facets carry the author names.
+            aggregates['author_updated_at'] = Max('author__updated_at')
+        return aggregates
+
+    def facet_rows(self, facets, queryset):
+        by_year, by_author = rollups.view_counts(self, queryset)
+        parts = {
+            'author': by_author.order_by('-total', 'author_id').values_list(
+                Value('author', output_field=CharField()), 'author_id', 'author__name', 'total',
+            ),
+            'publication_year': by_year.order_by('-total', 'publication_year').values_list(
+                Value('publication_year', output_field=CharField()), 'publication_year',
+                Value(None, output_field=CharField()), 'total',
+            ),
+        }
+        first, *rest = (parts[name][:self.facet_limit] for name in facets)
+        if not rest:
+            return first
+        if connections[first.db].features.supports_slicing_ordering_in_compound:
+            return first.union(*rest, all=True)
+        return chain(first, *rest)
+
+    def build_facets(self, facets, queryset):
+        values = {name: [] for name in facets}
+        for name, value, label, count in self.facet_rows(facets, queryset):
+            entry = {'value': value, 'count': count}
+            if name == 'author':
+                entry['label'] = label
+            values[name].append(entry)
+        # A UNION ALL doesn't promise to keep the order of its parts.
+        return {
+            name: sorted(entries, key=lambda entry: (-entry['count'], entry['value']))
+            for name, entries in values.items()
+        }
+
+    def list(self, request, *args, **kwargs):
+        facets = self.get_facets()
+        response = super().list(request, *args, **kwargs)
+        if facets and isinstance(response.data, dict):
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data['facets'] = self.build_facets(facets, queryset)
+        return response
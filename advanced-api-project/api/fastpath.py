@@ -0,0 +1,127 @@
+"""
+Read-only fast path for serializing list pages.
+
+``ModelSerializer.to_representation`` walks every field of every instance:
+``get_attribute``, ``to_representation`` and an ``OrderedDict`` insert per
+value, on top of building a model instance per row. For serializers whose
+fields all map one-to-one onto a database column and represent that value
+unchanged, the same output can be produced straight from
+``values_list()`` tuples with a single ``dict(zip(...))`` per row.
+
+``get_row_builder()`` inspects a serializer class once, caches the result,
+and returns a ``RowBuilder`` (or None when some field needs the regular
+serializer). The produced dicts have the same keys in the same order as the
+serializer's output, so rendered responses are byte-identical.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Serializer fields whose to_representation() returns values of the given
+# model field types unchanged.
+PASSTHROUGH_FIELDS = (
+    (serializers.BooleanField, (models.BooleanField,)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.IntegerField, (models.IntegerField,)),
+    # DRF >= 3.15 maps BigAutoField/BigIntegerField here.
+    (getattr(serializers, 'BigIntegerField', serializers.IntegerField), (models.IntegerField,)),
+    (serializers.ReadOnlyField, (models.Field,)),
+)
+
+
+class RowBuilder:
+    """Turns ``values_list(*columns)`` rows into serializer-shaped dicts."""
+
+    def __init__(self, keys, columns):
+        self.keys = keys
+        self.columns = columns
+
+    def build(self, row):
+        return dict(zip(self.keys, row))
+
+    def build_many(self, rows):
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+    def select(self, names, extra_columns=()):
+        """
+        A RowBuilder producing only the ``names`` keys. ``extra_columns``
+        not already selected are fetched after the others and left out of
+        the dicts, since ``zip()`` stops at the end of ``keys``.
+        """
+        pairs = [(key, column) for key, column in zip(self.keys, self.columns) if key in names]
+        keys = tuple(key for key, _ in pairs)
+        columns = tuple(column for _, column in pairs)
+        return RowBuilder(keys, columns + tuple(column for column in extra_columns if column not in columns))
+
+
+def _column_for(field, model):
+    """The attname backing a serializer field, or None if it isn't a plain column."""
+    if field.source == '*' or '.' in field.source:
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is None and (model_field.many_to_one or model_field.one_to_one):
+            return model_field.attname
+        return None
+    if model_field.is_relation or getattr(field, 'coerce_to_string', False):
+        return None
+    for field_class, model_field_classes in PASSTHROUGH_FIELDS:
+        if type(field) is field_class:
+            return model_field.attname if isinstance(model_field, model_field_classes) else None
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_row_builder(serializer_class):
+    """Return the RowBuilder for a ModelSerializer class, or None if unsupported."""
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+    # A custom to_representation() may reshape the output.
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        return None
+
+    model = serializer_class.Meta.model
+    keys = []
+    columns = []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        column = _column_for(field, model)
+        if column is None:
+            return None
+        keys.append(name)
+        columns.append(column)
+    return RowBuilder(tuple(keys), tuple(columns))
+
+
+class FastListMixin:
+    """
+    ListAPIView mixin serving list pages through ``get_row_builder()``.
+
+    Filtering, ordering and pagination run as usual, but on a
+    ``values_list()`` queryset; views whose serializer has no row builder
+    fall back to the regular ``list()``.
+    """
+    fast_path = True
+
+    def get_serializer_row_builder(self):
+        return get_row_builder(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        builder = self.get_serializer_row_builder() if self.fast_path else None
+        if builder is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*builder.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(builder.build_many(page))
+        return Response(builder.build_many(queryset))
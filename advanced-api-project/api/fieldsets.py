@@ -0,0 +1,139 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?omit=`` on read endpoints.
+
+Clients that only need some fields of a resource name them::
+
+    /api/books/?fields=id,title
+    /api/authors/?omit=books
+
+The selection narrows the response and the query behind it:
+
+* ``DynamicFieldsMixin`` makes a serializer drop the fields missing from
+  ``context['fields']``; nested serializers keep all of theirs.
+* ``SparseFieldsetMixin`` parses and validates the parameters, puts the
+  selection in the serializer context, loads only the selected columns
+  with ``only()`` and narrows the ``api.fastpath`` row builder, so pages
+  served from ``values_list()`` select fewer columns too.
+
+The primary key is always loaded (prefetches, the query cache and the
+conditional GET fingerprints rely on it), even when it isn't rendered.
+Writes ignore both parameters and respond with the full representation.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+from .fastpath import get_row_builder
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin keeping only the fields named in
+    ``context['fields']`` (all of them when it is missing or None).
+    """
+
+    def is_root_item(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        if selected is None or not self.is_root_item():
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class SparseFieldsetMixin:
+    """
+    GenericAPIView mixin selecting the rendered fields with ``?fields=``
+    (comma separated names to include) and ``?omit=`` (names to leave out).
+    Unknown names are rejected with a 400 listing the valid ones.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_readable_fields(self):
+        """``{name: field}`` of the serializer's output fields, in order."""
+        if not hasattr(self, '_readable_fields'):
+            fields = self.get_serializer_class()().fields
+            self._readable_fields = {name: field for name, field in fields.items() if not field.write_only}
+        return self._readable_fields
+
+    def get_selected_fields(self):
+        """The names to render, in serializer order, or None for all of them."""
+        if not hasattr(self, '_selected_fields'):
+            self._selected_fields = self.parse_selected_fields()
+        return self._selected_fields
+
+    def parse_selected_fields(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        names = list(self.get_readable_fields())
+        requested = {}
+        for param in (self.fields_query_param, self.omit_query_param):
+            value = params.get(param, '')
+            requested[param] = [name.strip() for name in value.split(',') if name.strip()]
+            if any(name not in names for name in requested[param]):
+                raise ValidationError({
+                    param: 'Must be a comma separated list of: %s.' % ', '.join(names),
+                })
+
+        included, omitted = requested[self.fields_query_param], requested[self.omit_query_param]
+        if not included and not omitted:
+            return None
+        return tuple(name for name in names if (not included or name in included) and name not in omitted)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_selected_fields()
+        return context
+
+    def get_only_fields(self, queryset, selected):
+        """
+        The model fields backing ``selected`` (plus the primary key), or None
+        when a field's source can't be traced to columns.
+        """
+        if queryset.query.select_related is True:
+            return None
+        model = queryset.model
+        names = [model._meta.pk.name]
+        if queryset.query.select_related:
+            # Deferring a relation that is also select_related is an error.
+            names.extend(queryset.query.select_related)
+        fields = self.get_readable_fields()
+        for name in selected:
+            source = fields[name].source
+            if source in queryset.query.annotations:
+                continue
+            if source == '*' or '.' in source:
+                return None
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # A property or method, which may read any column.
+                return None
+            # Reverse and many-to-many relations are prefetched separately.
+            if model_field.concrete and not model_field.many_to_many:
+                names.append(model_field.name)
+        return list(dict.fromkeys(names))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.get_selected_fields()
+        if selected is not None:
+            only = self.get_only_fields(queryset, selected)
+            if only is not None:
+                queryset = queryset.only(*only)
+        return queryset
+
+    def get_serializer_row_builder(self):
+        serializer_class = self.get_serializer_class()
+        builder = get_row_builder(serializer_class)
+        selected = self.get_selected_fields()
+        if builder is None or selected is None:
+            return builder
+        return builder.select(selected, extra_columns=(serializer_class.Meta.model._meta.pk.attname,))
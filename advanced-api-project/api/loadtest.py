@@ -0,0 +1,92 @@
+"""
+Concurrent throughput of the sync (DRF) and async read endpoints.
+
+Unlike ``api.benchmarks``, which calls views in-process, this drives real
+servers over HTTP with ``concurrency`` client threads, so it measures what
+the server model does under load: a WSGI server holds one worker per
+in-flight request, an ASGI server can interleave async views while their
+queries run. Start the servers against the same (seeded) database first,
+for example::
+
+    gunicorn advanced_api_project.wsgi:application -w 4 -b 127.0.0.1:8000
+    uvicorn advanced_api_project.asgi:application --workers 4 --port 8001
+
+and run ``manage.py loadtest_api --sync-base-url http://127.0.0.1:8000
+--async-base-url http://127.0.0.1:8001``. Every ``Pair`` is measured on the
+sync path against the first server and on the async path against the second.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from .benchmarks import percentile
+
+
+class Pair:
+    """The same GET request on the sync and on the async endpoint."""
+
+    def __init__(self, name, path, params=None):
+        self.name = name
+        self.path = path
+        self.params = params or {}
+
+    def urls(self, sync_base_url, async_base_url):
+        query = '?' + urlencode(self.params) if self.params else ''
+        return (
+            '%s/api/%s%s' % (sync_base_url.rstrip('/'), self.path, query),
+            '%s/api/async/%s%s' % (async_base_url.rstrip('/'), self.path, query),
+        )
+
+
+PAIRS = [
+    Pair('book-list', 'books/'),
+    Pair('book-list-page-1000', 'books/', {'page_size': 1000}),
+    Pair('book-list-search', 'books/', {'search': 'Winter'}),
+    Pair('book-detail', 'books/1/'),
+    Pair('author-list-book-count', 'authors/', {'books': 'count'}),
+    Pair('author-detail', 'authors/1/'),
+]
+
+
+def _fetch(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as exc:
+        status = exc.code
+    return time.perf_counter() - started, status
+
+
+def load(url, concurrency=32, requests=1000, timeout=30):
+    """Issue ``requests`` GETs of ``url`` from ``concurrency`` threads."""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(lambda _: _fetch(url, timeout), range(requests)))
+        elapsed = time.perf_counter() - started
+    latencies = [latency * 1000 for latency, _ in results]
+    return {
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'errors': sum(1 for _, status in results if status != 200),
+    }
+
+
+def run(sync_base_url, async_base_url, pairs=None, concurrency=32, requests=1000, warmup=10):
+    """Load every pair on both paths; return ``{name: {'sync': ..., 'async': ...}}``."""
+    results = {}
+    for pair in pairs or PAIRS:
+        measured = {}
+        for path, url in zip(('sync', 'async'), pair.urls(sync_base_url, async_base_url)):
+            for _ in range(warmup):
+                _fetch(url, timeout=30)
+            measured[path] = load(url, concurrency=concurrency, requests=requests)
+        measured['speedup'] = round(
+            measured['async']['requests_per_second'] / measured['sync']['requests_per_second'], 2,
+        )
+        results[pair.name] = measured
+    return results
@@ -0,0 +1,158 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api import benchmarks, factories
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with synthetic authors and books and "
+        "measure latency, queries per request and response size of the api "
+        "endpoints. Results are written as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--authors', type=int, default=10000,
+            help='Number of authors to seed (default: 10000).',
+        )
+        parser.add_argument(
+            '--books', type=int, default=100000,
+            help='Number of books to seed (default: 100000).',
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=20,
+            help='Measured requests per scenario (default: 20).',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=1,
+            help='Unmeasured requests per scenario (default: 1).',
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', metavar='NAME',
+            help='Only run the named scenario; may be repeated.',
+        )
+        parser.add_argument(
+            '--page-sizes', default='100,250,500,1000',
+            help='Comma separated page sizes for the serializer fast path '
+                 'comparison; empty to skip it (default: 100,250,500,1000).',
+        )
+        parser.add_argument(
+            '--search-terms', default='winter,murakami,zumi,kashiro',
+            help='Comma separated terms for the icontains vs. trigram search '
+                 'comparison; empty to skip it (default: winter,murakami,zumi,kashiro).',
+        )
+        parser.add_argument(
+            '--renderer-rows', type=int, default=10000,
+            help='Rows of the JSON vs. compact renderer comparison; 0 to skip it '
+                 '(default: 10000).',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed of the synthetic dataset (default: 0).',
+        )
+        parser.add_argument(
+            '--output', '-o', default='-',
+            help='Write the JSON results to this file instead of stdout.',
+        )
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='Print the change of each metric against an earlier results file.',
+        )
+
+    def get_scenarios(self, names):
+        if not names:
+            return benchmarks.SCENARIOS
+        by_name = {scenario.name: scenario for scenario in benchmarks.SCENARIOS}
+        unknown = sorted(set(names) - set(by_name))
+        if unknown:
+            raise CommandError(
+                'Unknown scenario(s): %s. Choose from: %s.'
+                % (', '.join(unknown), ', '.join(by_name))
+            )
+        return [by_name[name] for name in names]
+
+    def git_revision(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def handle(self, *args, **options):
+        scenarios = self.get_scenarios(options['scenarios'])
+        try:
+            page_sizes = [int(size) for size in options['page_sizes'].split(',') if size]
+        except ValueError:
+            raise CommandError('--page-sizes must be a comma separated list of integers.')
+        search_terms = [term for term in options['search_terms'].split(',') if term]
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)['results']
+
+        # Never touch the configured database: seed and measure against a
+        # fresh test database that is destroyed afterwards.
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stderr.write('Seeding %(authors)d authors and %(books)d books...' % options)
+            factories.create_library(options['authors'], options['books'], seed=options['seed'])
+            results = {}
+            for scenario in scenarios:
+                self.stderr.write('Running %s...' % scenario.name)
+                results.update(benchmarks.run(
+                    [scenario], iterations=options['iterations'], warmup=options['warmup'],
+                ))
+            fast_path = None
+            if page_sizes:
+                self.stderr.write('Comparing BookSerializer with the fast path...')
+                fast_path = benchmarks.fast_path_speedup(page_sizes, iterations=options['iterations'])
+            search = None
+            if search_terms:
+                self.stderr.write('Comparing icontains with trigram search...')
+                search = benchmarks.search_speedup(search_terms, iterations=options['iterations'])
+            renderers = None
+            if options['renderer_rows']:
+                self.stderr.write('Comparing renderers on %(renderer_rows)d rows...' % options)
+                renderers = benchmarks.renderer_sizes(options['renderer_rows'], iterations=options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'revision': self.git_revision(),
+                'authors': options['authors'],
+                'books': options['books'],
+                'seed': options['seed'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+            'fast_path': fast_path,
+            'search': search,
+            'renderers': renderers,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS('Results written to %s.' % options['output']))
+
+        if baseline is not None:
+            for name, metric, before, after, ratio in benchmarks.compare(baseline, results):
+                change = '%+.1f%%' % ((ratio - 1) * 100) if ratio is not None else 'n/a'
+                self.stderr.write('%-28s %-8s %12s -> %-12s %s' % (name, metric, before, after, change))
@@ -0,0 +1,78 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Load running servers with concurrent requests and compare the "
+        "throughput and latency of the sync api endpoints with their async "
+        "variants. See api.loadtest for how to start the servers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sync-base-url', default='http://127.0.0.1:8000',
+            help='Server for the sync endpoints, e.g. gunicorn (default: http://127.0.0.1:8000).',
+        )
+        parser.add_argument(
+            '--async-base-url', default='http://127.0.0.1:8001',
+            help='Server for the async endpoints, e.g. uvicorn (default: http://127.0.0.1:8001).',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=32,
+            help='Concurrent client threads (default: 32).',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Measured requests per endpoint (default: 1000).',
+        )
+        parser.add_argument(
+            '--pair', action='append', dest='pairs', metavar='NAME',
+            help='Only run the named endpoint pair; may be repeated.',
+        )
+        parser.add_argument(
+            '--output', '-o', default='-',
+            help='Write the JSON results to this file instead of stdout.',
+        )
+
+    def get_pairs(self, names):
+        if not names:
+            return loadtest.PAIRS
+        by_name = {pair.name: pair for pair in loadtest.PAIRS}
+        unknown = sorted(set(names) - set(by_name))
+        if unknown:
+            raise CommandError(
+                'Unknown pair(s): %s. Choose from: %s.'
+                % (', '.join(unknown), ', '.join(by_name))
+            )
+        return [by_name[name] for name in names]
+
+    def handle(self, *args, **options):
+        pairs = self.get_pairs(options['pairs'])
+        try:
+            results = loadtest.run(
+                options['sync_base_url'], options['async_base_url'], pairs,
+                concurrency=options['concurrency'], requests=options['requests'],
+            )
+        except OSError as exc:
+            raise CommandError('Could not reach the servers: %s' % exc)
+
+        report = {
+            'meta': {
+                'sync_base_url': options['sync_base_url'],
+                'async_base_url': options['async_base_url'],
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+            },
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS('Results written to %s.' % options['output']))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import BATCH_SIZE, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the materialized book counts per author, year and "
+        "(author, year). Saves, deletes and the bulk endpoints keep them "
+        "current afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Number of rollup rows written per INSERT (default: %d).' % BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        rebuild_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Rebuilt the book count rollups.'))
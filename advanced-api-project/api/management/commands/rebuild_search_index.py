@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.search import BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the trigram search index of book titles and author names. "
+        "Saves and the bulk endpoints keep it current afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Number of index rows written per INSERT (default: %d).' % BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Rebuilt the search index.'))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_index(apps, schema_editor):
+    from api.search import trigrams
+
+    for model_name, source_name, column, field in (
+        ('BookTitleTrigram', 'Book', 'book_id', 'title'),
+        ('AuthorNameTrigram', 'Author', 'author_id', 'name'),
+    ):
+        trigram_model = apps.get_model('api', model_name)
+        rows = apps.get_model('api', source_name).objects.values_list('pk', field)
+        trigram_model.objects.bulk_create([
+            trigram_model(trigram=gram, **{column: pk})
+            for pk, text in rows.iterator() for gram in trigrams(text)
+        ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorNameTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('author', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.author')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['trigram', 'author'], name='api_author_trigram_idx')],
+                'constraints': [models.UniqueConstraint(fields=('author', 'trigram'), name='api_author_trigram_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookTitleTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('book', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.book')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['trigram', 'book'], name='api_book_trigram_idx')],
+                'constraints': [models.UniqueConstraint(fields=('book', 'trigram'), name='api_book_trigram_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_rollups(apps, schema_editor):
+    Book = apps.get_model('api', 'Book')
+    BookCountRollup = apps.get_model('api', 'BookCountRollup')
+    books = Book.objects.order_by()
+    for fields in (('author_id', 'publication_year'), ('author_id',), ('publication_year',)):
+        groups = books.values(*fields).annotate(rollup_count=models.Count('pk')).values_list(*fields, 'rollup_count')
+        BookCountRollup.objects.bulk_create([
+            BookCountRollup(count=group[-1], **dict(zip(fields, group))) for group in groups.iterator()
+        ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookCountRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_year', models.IntegerField(null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.author')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['publication_year', 'author'], name='api_rollup_year_author_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('author__isnull', False), ('publication_year__isnull', False)), fields=('author', 'publication_year'), name='api_rollup_author_year_uniq'), models.UniqueConstraint(condition=models.Q(('publication_year__isnull', True)), fields=('author',), name='api_rollup_author_uniq'), models.UniqueConstraint(condition=models.Q(('author__isnull', True)), fields=('publication_year',), name='api_rollup_year_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
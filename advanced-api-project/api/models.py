@@ -7,8 +7,18 @@ class Author(models.Model):
     
     Attributes:
         name (CharField): The name of the author (max length: 100 characters)
+        updated_at (DateTimeField): When the author was last saved
     """
     name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # author__name filters and search on BookListView.
+            models.Index(fields=['name'], name='api_author_name_idx'),
+            # Max(updated_at) of the ETag fingerprints (see api.conditional).
+            models.Index(fields=['updated_at'], name='api_author_updated_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -21,10 +31,102 @@ class Book(models.Model):
         title (CharField): The title of the book (max length: 200 characters)
         publication_year (IntegerField): The year the book was published
         author (ForeignKey): A reference to the Author of this book
+        updated_at (DateTimeField): When the book was last saved
     """
     title = models.CharField(max_length=200)
     publication_year = models.IntegerField()  # Added the missing publication_year field
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # Default ordering and ?ordering=title on BookListView.
+            models.Index(fields=['title'], name='api_book_title_idx'),
+            # ?publication_year= filter and ?ordering=publication_year.
+            models.Index(fields=['publication_year'], name='api_book_pub_year_idx'),
+            # Max(updated_at) of the ETag fingerprints (see api.conditional).
+            models.Index(fields=['updated_at'], name='api_book_updated_idx'),
+        ]
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class BookTitleTrigram(models.Model):
+    """
+    Inverted trigram index of book titles, maintained by api.search.
+
+    Attributes:
+        trigram (CharField): A lowercased three-character sequence of the title
+        book (ForeignKey): The book whose title contains the trigram
+    """
+    trigram = models.CharField(max_length=3)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+', db_index=False)
+
+    class Meta:
+        constraints = [
+            # Also serves the per-book rank lookups.
+            models.UniqueConstraint(fields=['book', 'trigram'], name='api_book_trigram_uniq'),
+        ]
+        indexes = [
+            # Trigram -> books posting lists.
+            models.Index(fields=['trigram', 'book'], name='api_book_trigram_idx'),
+        ]
+
+
+class AuthorNameTrigram(models.Model):
+    """
+    Inverted trigram index of author names, maintained by api.search.
+
+    Attributes:
+        trigram (CharField): A lowercased three-character sequence of the name
+        author (ForeignKey): The author whose name contains the trigram
+    """
+    trigram = models.CharField(max_length=3)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='+', db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'trigram'], name='api_author_trigram_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['trigram', 'author'], name='api_author_trigram_idx'),
+        ]
+
+
+class BookCountRollup(models.Model):
+    """
+    Materialized book counts, maintained by api.rollups.
+
+    Holds three grouping sets: one row per (author, year), per author
+    (``publication_year`` is NULL) and per year (``author`` is NULL).
+
+    Attributes:
+        author (ForeignKey): The author counted, or NULL for per-year totals
+        publication_year (IntegerField): The year counted, or NULL for per-author totals
+        count (PositiveIntegerField): The number of matching books
+    """
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='+', null=True, db_index=False)
+    publication_year = models.IntegerField(null=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also serves author__name filters on the (author, year) rows.
+            models.UniqueConstraint(
+                fields=['author', 'publication_year'], name='api_rollup_author_year_uniq',
+                condition=models.Q(author__isnull=False, publication_year__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=['author'], name='api_rollup_author_uniq',
+                condition=models.Q(publication_year__isnull=True),
+            ),
+            models.UniqueConstraint(
+                fields=['publication_year'], name='api_rollup_year_uniq',
+                condition=models.Q(author__isnull=True),
+            ),
+        ]
+        indexes = [
+            # publication_year filters on the (author, year) rows.
+            models.Index(fields=['publication_year', 'author'], name='api_rollup_year_author_idx'),
+        ]
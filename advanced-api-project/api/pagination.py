@@ -0,0 +1,11 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class BookPagination(PageNumberPagination):
+    """
+    Page-number pagination for book lists. Clients may ask for larger pages
+    with ``?page_size=``, up to ``max_page_size``.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,176 @@
+"""
+Cached list query results.
+
+Clients of BookListView repeat a small set of filter/search/ordering/page
+combinations. ``QueryCacheMixin`` remembers, per normalized combination, the
+primary keys of the page and the total count, and the conditional GET
+fingerprint (see ``api.conditional``), so a repeated request skips the
+fingerprint aggregate, the COUNT and the filtered/sorted page query and
+only hydrates the page with one ``pk__in`` lookup.
+
+Entries live in a bounded in-process ``LRUCache`` and expire after
+``ttl`` seconds; their keys embed the version of the ``books`` namespace
+(see ``api.versioning``), which ``api.signals`` and the bulk endpoints
+bump on every Book or Author write. The version only reaches other
+processes through a shared cache backend, so with the default
+``LocMemCache`` the query cache is not used at all.
+"""
+import threading
+import time
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
+
+from .versioning import bump_versions, get_version, is_shared
+
+NAMESPACE = 'books'
+
+
+def invalidate_query_cache():
+    bump_versions(NAMESPACE)
+
+
+class LRUCache:
+    """
+    A thread-safe mapping holding at most ``max_entries`` items, each for
+    at most ``ttl`` seconds (forever when None).
+    """
+
+    def __init__(self, max_entries=512, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedPageRows:
+    """
+    Stands in for the filtered queryset when the page is cached: the Django
+    paginator takes the total from ``count()`` and slices out the page, which
+    is hydrated by primary key.
+    """
+
+    def __init__(self, ids, count, hydrate):
+        self.ids = ids
+        self._count = count
+        self.hydrate = hydrate
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        # The paginator only asks for the page the ids were cached for.
+        return self.hydrate(self.ids)
+
+
+class QueryCacheMixin:
+    """
+    ListAPIView mixin caching page ids and the conditional GET fingerprint
+    per normalized query. It must come before ConditionalGetMixin.
+
+    The key is made of the view, the filterset fields, the search terms,
+    the ordering and the effective page number and size; parameters that
+    don't change the result are ignored. Subclasses set ``query_cache``.
+    """
+    query_cache = None
+
+    def use_query_cache(self):
+        return self.query_cache is not None and is_shared()
+
+    def get_filter_cache_key(self):
+        """The view, the namespace version and the normalized filters."""
+        params = self.request.query_params
+        key = [type(self).__name__, get_version(NAMESPACE)]
+        for name in sorted(getattr(self, 'filterset_fields', ())):
+            key.append((name, tuple(params.getlist(name))))
+        # SearchFilter splits terms on whitespace and commas.
+        key.append(' '.join(params.get('search', '').replace(',', ' ').split()))
+        return tuple(key)
+
+    def get_query_cache_key(self):
+        params = self.request.query_params
+        paginator = self.paginator
+        ordering = params.get('ordering', '').replace(' ', '')
+        if not ordering:
+            ordering = ','.join(getattr(self, 'ordering', ()))
+            if params.get('search', '').strip():
+                # Searches are ranked unless ordered explicitly (see
+                # api.search.RankedOrderingFilter).
+                ordering = '-search_rank,' + ordering
+        page = params.get(paginator.page_query_param, '1')
+        return self.get_filter_cache_key() + (ordering, page, paginator.get_page_size(self.request))
+
+    def get_fingerprint(self):
+        # Ordering and pages don't change the fingerprint; the aggregates
+        # requested (facets add some) do.
+        if not self.use_query_cache():
+            return super().get_fingerprint()
+        key = self.get_filter_cache_key() + ('fingerprint',) + tuple(sorted(self.get_fingerprint_aggregates()))
+        fingerprint = self.query_cache.get(key)
+        if fingerprint is None:
+            fingerprint = super().get_fingerprint()
+            self.query_cache.set(key, fingerprint)
+        return fingerprint
+
+    def get_row_pk(self, queryset):
+        fields = queryset.query.values_select
+        if not fields:
+            return attrgetter('pk')
+        return itemgetter(fields.index(queryset.model._meta.pk.attname))
+
+    def hydrate(self, queryset, ids):
+        """Load the rows of ``ids`` in the shape of ``queryset``, in ``ids`` order."""
+        rows = self.get_queryset().filter(pk__in=ids).order_by()
+        fields = queryset.query.values_select
+        if fields:
+            rows = rows.values_list(*fields)
+        row_pk = self.get_row_pk(queryset)
+        by_pk = {row_pk(row): row for row in rows}
+        return [by_pk[pk] for pk in ids if pk in by_pk]
+
+    def paginate_queryset(self, queryset):
+        if not self.use_query_cache() or self.paginator is None:
+            return super().paginate_queryset(queryset)
+
+        key = self.get_query_cache_key()
+        entry = self.query_cache.get(key)
+        if entry is not None:
+            ids, count = entry
+            return super().paginate_queryset(
+                CachedPageRows(ids, count, lambda ids: self.hydrate(queryset, ids))
+            )
+
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            row_pk = self.get_row_pk(queryset)
+            self.query_cache.set(key, ([row_pk(row) for row in page], self.paginator.page.paginator.count))
+        return page
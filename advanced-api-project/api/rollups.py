@@ -0,0 +1,215 @@
+"""
+Materialized book counts per author, per year and per (author, year).
+
+``BookCountRollup`` holds the three grouping sets of the book table, so the
+statistics endpoint reads a few hundred rollup rows instead of grouping
+every matching book: per-year counts come from the per-year rows (or the
+(author, year) rows of the filtered authors), per-author counts from the
+per-author rows (or the (author, year) rows of the filtered year).
+
+The rows are adjusted incrementally: ``api.signals`` records +1/-1 for every
+Book save and delete, and the bulk endpoints record their whole batch at
+once. Inside ``deferred()`` the changes are collected and applied in one go
+when the block exits. ``rebuild_rollups()`` (or ``manage.py
+rebuild_book_rollups``) recomputes them from scratch.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django_filters.constants import EMPTY_VALUES
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .models import Book, BookCountRollup
+from .search import TrigramSearchFilter
+
+BATCH_SIZE = 5000
+
+# BookListView filters the rollups can answer, and the dimension each one
+# restricts.
+DIMENSION_FILTERS = {
+    'author__name': 'author',
+    'publication_year': 'publication_year',
+}
+
+_local = threading.local()
+
+
+def book_key(book):
+    return (book.author_id, book.publication_year)
+
+
+def record(deltas):
+    """
+    Add ``deltas`` (a mapping of ``(author_id, publication_year)`` to a
+    change in the number of books) to the rollups.
+    """
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.update(deltas)
+    else:
+        apply(deltas)
+
+
+@contextmanager
+def deferred():
+    """Collect what is recorded in the block and apply it once at the end."""
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = Counter()
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+    apply(pending)
+
+
+def add_to_rollup(author_id, year, delta):
+    """Add ``delta`` to one rollup row, inserting it if it doesn't exist."""
+    rows = BookCountRollup.objects.filter(author_id=author_id, publication_year=year)
+    while not rows.update(count=F('count') + delta):
+        try:
+            with transaction.atomic():
+                BookCountRollup.objects.create(author_id=author_id, publication_year=year, count=delta)
+            return
+        except IntegrityError:
+            # Inserted by a concurrent transaction since the update: retry it.
+            continue
+
+
+def apply(deltas):
+    counts = Counter()
+    for (author_id, year), delta in deltas.items():
+        for key in ((author_id, year), (author_id, None), (None, year)):
+            counts[key] += delta
+    counts = {key: delta for key, delta in counts.items() if delta}
+    if not counts:
+        return
+
+    author_ids = {author_id for author_id, _ in counts if author_id is not None}
+    years = {year for _, year in counts if year is not None}
+    with transaction.atomic(savepoint=False):
+        rows = BookCountRollup.objects.select_for_update().filter(
+            Q(author_id__in=author_ids, publication_year__in=years)
+            | Q(author_id__in=author_ids, publication_year=None)
+            | Q(author=None, publication_year__in=years)
+        )
+        existing = {(row.author_id, row.publication_year): row for row in rows}
+        changed, emptied, created = [], [], []
+        for (author_id, year), delta in counts.items():
+            row = existing.get((author_id, year))
+            if row is None:
+                # A decrement without a row was already removed by a cascade.
+                if delta > 0:
+                    created.append(BookCountRollup(author_id=author_id, publication_year=year, count=delta))
+                continue
+            row.count = max(row.count + delta, 0)
+            (changed if row.count else emptied).append(row)
+        BookCountRollup.objects.bulk_update(changed, ['count'], batch_size=BATCH_SIZE)
+        if emptied:
+            BookCountRollup.objects.filter(pk__in=[row.pk for row in emptied]).delete()
+        if created:
+            try:
+                with transaction.atomic():
+                    BookCountRollup.objects.bulk_create(created, batch_size=BATCH_SIZE)
+            except IntegrityError:
+                # SELECT ... FOR UPDATE has no row to lock for a new key, so a
+                # concurrent first write may have inserted some of them.
+                for row in created:
+                    add_to_rollup(row.author_id, row.publication_year, row.count)
+
+
+def rebuild_rollups(batch_size=BATCH_SIZE):
+    """Recompute every rollup row from the book table."""
+    books = Book.objects.order_by()
+    with transaction.atomic():
+        BookCountRollup.objects.all().delete()
+        for fields in (('author_id', 'publication_year'), ('author_id',), ('publication_year',)):
+            groups = books.values(*fields).annotate(rollup_count=Count('pk')).values_list(*fields, 'rollup_count')
+            rows = (
+                BookCountRollup(count=group[-1], **dict(zip(fields, group)))
+                for group in groups.iterator(chunk_size=batch_size)
+            )
+            while batch := list(islice(rows, batch_size)):
+                BookCountRollup.objects.bulk_create(batch)
+
+
+def can_answer(filters):
+    """Whether the rollups can answer counts restricted by ``filters``."""
+    return set(filters) <= set(DIMENSION_FILTERS)
+
+
+def rollup_counts(filters):
+    """
+    Per-year and per-author ``values()`` querysets (with a ``total``) of the
+    books matching ``filters``, read from the rollups.
+    """
+    rows = BookCountRollup.objects.order_by()
+    restricted = {DIMENSION_FILTERS[name] for name in filters}
+    # Use the totals of the grouped dimension unless the other one is
+    # restricted too, in which case only the (author, year) rows say which
+    # part of each total matches.
+    by_year = rows.filter(publication_year__isnull=False, **filters)
+    by_year = by_year.filter(author__isnull=False) if 'author' in restricted else by_year.filter(author=None)
+    by_author = rows.filter(author__isnull=False, **filters)
+    if 'publication_year' in restricted:
+        by_author = by_author.filter(publication_year__isnull=False)
+    else:
+        by_author = by_author.filter(publication_year=None)
+    return (
+        by_year.values('publication_year').annotate(total=Sum('count')),
+        by_author.values('author_id', 'author__name').annotate(total=Sum('count')),
+    )
+
+
+def book_counts(queryset):
+    """Per-year and per-author counts grouped from a (filtered) Book queryset."""
+    queryset = queryset.order_by()
+    return (
+        queryset.values('publication_year').annotate(total=Count('pk')),
+        queryset.values('author_id', 'author__name').annotate(total=Count('pk')),
+    )
+
+
+def view_counts(view, queryset):
+    """
+    Per-year and per-author counts of ``queryset``, the view's filtered
+    queryset: read from the rollups unless the request searches or filters
+    on something they don't break down.
+    """
+    filterset = DjangoFilterBackend().get_filterset(view.request, view.get_queryset(), view)
+    filters = {}
+    if filterset is not None and filterset.is_valid():
+        filters = {
+            name: value for name, value in filterset.form.cleaned_data.items()
+            if value not in EMPTY_VALUES
+        }
+    if TrigramSearchFilter().get_search_terms(view.request) or not can_answer(filters):
+        return book_counts(queryset)
+    return rollup_counts(filters)
+
+
+def summarize(by_year, by_author, max_authors=100):
+    """The statistics response for per-year and per-author count querysets."""
+    years = [
+        {'publication_year': row['publication_year'], 'count': row['total']}
+        for row in by_year.order_by('publication_year')
+    ]
+    decades = Counter()
+    for year in years:
+        decades[year['publication_year'] // 10 * 10] += year['count']
+    authors = by_author.order_by('-total', 'author__name', 'author_id')[:max_authors]
+    return {
+        'count': sum(year['count'] for year in years),
+        'publication_years': years,
+        'decades': [{'decade': decade, 'count': count} for decade, count in sorted(decades.items())],
+        'authors': [
+            {'id': row['author_id'], 'name': row['author__name'], 'count': row['total']}
+            for row in authors
+        ],
+    }
@@ -0,0 +1,169 @@
+"""
+Trigram search for book titles and author names.
+
+``SearchFilter`` compiles every term to ``icontains`` over a JOIN, which no
+B-tree index can serve. ``TrigramSearchFilter`` instead looks terms up in
+inverted trigram index tables (``BookTitleTrigram``, ``AuthorNameTrigram``):
+a text matches a term when it contains enough of the term's trigrams, so
+candidates come from index range scans on ``trigram``.
+
+A text containing the term contains all of its trigrams, so every
+``icontains`` match is found. Requiring only ``threshold`` of them also
+finds near misses (typos, missing letters); results are ranked by the
+number of matching trigrams, so exact matches come first.
+
+The index tables are kept current by ``api.signals`` and the bulk
+endpoints; ``rebuild_index()`` (or ``manage.py rebuild_search_index``)
+recreates them from scratch.
+"""
+import math
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework import filters
+
+from .models import Author, AuthorNameTrigram, Book, BookTitleTrigram
+
+BATCH_SIZE = 5000
+
+
+def trigrams(text):
+    """Index trigrams of a text: every word padded like pg_trgm (``'  word '``)."""
+    grams = set()
+    for word in re.findall(r'\w+', text.casefold()):
+        padded = '  %s ' % word
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+def term_trigrams(term):
+    """Query trigrams of a search term: unpadded, so terms match inside words."""
+    grams = set()
+    for word in re.findall(r'\w+', term.casefold()):
+        grams.update(word[index:index + 3] for index in range(len(word) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    An index table plus how it joins a searched queryset: rows of ``model``
+    point through ``column`` at the value of the queryset's ``field``.
+    """
+
+    def __init__(self, model, column, field):
+        self.model = model
+        self.column = column
+        self.field = field
+
+    def matching(self, grams, min_hits):
+        """Values of ``column`` whose text has at least ``min_hits`` of ``grams``."""
+        return self.model.objects.filter(trigram__in=grams).values(self.column).annotate(
+            hits=Count('pk'),
+        ).filter(hits__gte=min_hits).values(self.column)
+
+    def hits(self, grams):
+        """Correlated count of ``grams`` in the text of the outer row."""
+        return Coalesce(Subquery(
+            self.model.objects.filter(trigram__in=grams, **{self.column: OuterRef(self.field)})
+            .values(self.column).annotate(hits=Count('pk')).values('hits'),
+            output_field=IntegerField(),
+        ), 0)
+
+
+# (queryset model, search field) -> index serving it.
+INDEXES = {
+    (Book, 'title'): TrigramIndex(BookTitleTrigram, 'book_id', 'pk'),
+    (Book, 'author__name'): TrigramIndex(AuthorNameTrigram, 'author_id', 'author_id'),
+    (Author, 'name'): TrigramIndex(AuthorNameTrigram, 'author_id', 'pk'),
+}
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter answering ``?search=`` from the trigram indexes.
+
+    Like SearchFilter, every term must match at least one search field.
+    Matches are annotated with ``search_rank`` and ordered by it. Terms
+    without a trigram (shorter than three letters) and search fields
+    without an index fall back to SearchFilter's ``icontains``.
+    """
+    threshold = 0.6
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        indexes = [INDEXES.get((queryset.model, field)) for field in search_fields]
+        if None in indexes:
+            return super().filter_queryset(request, queryset, view)
+
+        rank = Value(0)
+        for term in search_terms:
+            grams = term_trigrams(term)
+            if not grams:
+                queryset = queryset.filter(reduce(or_, (
+                    Q(**{'%s__icontains' % field: term}) for field in search_fields
+                )))
+                continue
+            min_hits = max(1, math.ceil(len(grams) * self.threshold))
+            queryset = queryset.filter(reduce(or_, (
+                Q(**{'%s__in' % index.field: index.matching(grams, min_hits)}) for index in indexes
+            )))
+            for index in indexes:
+                rank = rank + index.hits(grams)
+        return queryset.annotate(search_rank=rank).order_by('-search_rank', *queryset.query.order_by)
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that keeps ``search_rank`` as the primary order of
+    searched querysets unless the client asks for an explicit ``?ordering=``.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if 'search_rank' in queryset.query.annotations and not request.query_params.get(self.ordering_param):
+            return ['-search_rank', *(ordering or ())]
+        return ordering
+
+
+def _index(trigram_model, column, rows, replace):
+    """Write the index rows of ``(pk, text)`` pairs, replacing existing ones."""
+    rows = list(rows)
+    with transaction.atomic():
+        if replace:
+            trigram_model.objects.filter(**{'%s__in' % column: [pk for pk, _ in rows]}).delete()
+        trigram_model.objects.bulk_create([
+            trigram_model(trigram=gram, **{column: pk})
+            for pk, text in rows for gram in trigrams(text)
+        ], batch_size=BATCH_SIZE)
+
+
+def index_books(books, replace=True):
+    """(Re-)index book titles; pass ``replace=False`` for freshly created books."""
+    _index(BookTitleTrigram, 'book_id', [(book.pk, book.title) for book in books], replace)
+
+
+def index_authors(authors, replace=True):
+    _index(AuthorNameTrigram, 'author_id', [(author.pk, author.name) for author in authors], replace)
+
+
+def rebuild_index(batch_size=BATCH_SIZE):
+    """Recreate both index tables, ``batch_size`` rows at a time."""
+    for trigram_model, column, source in (
+        (BookTitleTrigram, 'book_id', Book.objects.values_list('pk', 'title')),
+        (AuthorNameTrigram, 'author_id', Author.objects.values_list('pk', 'name')),
+    ):
+        trigram_model.objects.all().delete()
+        batch = []
+        for pk, text in source.order_by('pk').iterator(chunk_size=batch_size):
+            batch.extend(trigram_model(trigram=gram, **{column: pk}) for gram in trigrams(text))
+            if len(batch) >= batch_size:
+                trigram_model.objects.bulk_create(batch)
+                batch = []
+        trigram_model.objects.bulk_create(batch)
@@ -1,16 +1,192 @@
+from collections import Counter
+
 from rest_framework import serializers
+from django.db import transaction
+from django.utils import timezone
+from .fieldsets import DynamicFieldsMixin
 from .models import Author, Book
+from .rollups import book_key, record
+from .search import index_books
+from .signals import catalogue_changed
 from datetime import datetime
 
-class BookSerializer(serializers.ModelSerializer):
+FUTURE_YEAR_MESSAGE = "Publication year cannot be in the future."
+
+# Largest number of items accepted by one bulk request.
+BULK_MAX_ITEMS = 10000
+
+
+class BookListSerializer(serializers.ListSerializer):
+    """
+    List serializer behind the bulk book endpoints.
+
+    Items are validated one by one (errors are reported per item, in input
+    order), except for the publication year check, which runs once over the
+    whole list. Writes go through ``bulk_create``/``bulk_update`` in batches
+    of ``batch_size``, each batch in its own transaction.
+
+    For updates, ``instance`` is a Book queryset and every item must carry
+    the ``id`` of the book it changes.
+    """
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(input_type=type(data).__name__)
+            raise serializers.ValidationError({'non_field_errors': [message]}, code='not_a_list')
+        if not self.allow_empty and not data:
+            raise serializers.ValidationError({'non_field_errors': [self.error_messages['empty']]}, code='empty')
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages['max_length'].format(max_length=self.max_length)
+            raise serializers.ValidationError({'non_field_errors': [message]}, code='max_length')
+
+        self.context.update(self.get_validation_context(data))
+        books = self.get_books(data) if self.instance is not None else None
+        seen = set()
+        validated = []
+        errors = []
+        for index, item in enumerate(data):
+            try:
+                if books is not None:
+                    self.child.instance = self.get_book(item, books, seen)
+                validated.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                errors.append(exc.detail)
+        self.child.instance = None
+
+        self.validate_publication_years(validated, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        if books is not None:
+            self.bulk_instances = [books[item['id']] for item in data]
+        return validated
+
+    def get_validation_context(self, data):
+        """
+        Values shared by the validation of every item: the referenced
+        authors, resolved with one ``in_bulk`` query (see
+        ``PrefetchedPrimaryKeyRelatedField``), and the current year.
+        """
+        author_field = self.child.fields['author']
+        pks = set()
+        for item in data:
+            pk = author_field.to_pk(item.get('author')) if isinstance(item, dict) else None
+            if pk is not None:
+                pks.add(pk)
+        authors = dict.fromkeys(pks)
+        authors.update(author_field.get_queryset().in_bulk(pks))
+        return {'authors': authors, 'current_year': datetime.now().year}
+
+    def get_books(self, data):
+        ids = [item.get('id') for item in data if isinstance(item, dict)]
+        return self.instance.in_bulk([pk for pk in ids if type(pk) is int])
+
+    def get_book(self, item, books, seen):
+        pk = item.get('id') if isinstance(item, dict) else None
+        # bool is an int subclass (True == 1): {"id": true} is not book 1.
+        if type(pk) is not int or pk not in books:
+            raise serializers.ValidationError({'id': ['Book with this id does not exist.']})
+        if pk in seen:
+            raise serializers.ValidationError({'id': ['Book is listed more than once.']})
+        seen.add(pk)
+        return books[pk]
+
+    def validate_publication_years(self, validated, errors):
+        """Vectorized BookSerializer.validate_publication_year."""
+        current_year = self.context['current_year']
+        for attrs, item_errors in zip(validated, errors):
+            if attrs is not None and attrs.get('publication_year', current_year) > current_year:
+                item_errors['publication_year'] = [FUTURE_YEAR_MESSAGE]
+
+    def batches(self, items):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def create(self, validated_data):
+        books = [Book(**attrs) for attrs in validated_data]
+        for batch in self.batches(books):
+            with transaction.atomic():
+                Book.objects.bulk_create(batch)
+                index_books(batch, replace=False)
+                record(Counter(book_key(book) for book in batch))
+        # bulk_create() sends no post_save signals.
+        catalogue_changed()
+        return books
+
+    def update(self, instance, validated_data):
+        books = self.bulk_instances
+        old_keys = [book_key(book) for book in books]
+        fields = set()
+        # bulk_update() skips auto_now, but the ETag fingerprints rely on it.
+        now = timezone.now()
+        for book, attrs in zip(books, validated_data):
+            for field, value in attrs.items():
+                setattr(book, field, value)
+            book.updated_at = now
+            fields.update(attrs)
+        if fields:
+            fields.add('updated_at')
+            for batch, old_batch_keys in zip(self.batches(books), self.batches(old_keys)):
+                with transaction.atomic():
+                    Book.objects.bulk_update(batch, sorted(fields))
+                    if 'title' in fields:
+                        index_books(batch)
+                    if {'author', 'publication_year'} & fields:
+                        deltas = Counter(book_key(book) for book in batch)
+                        deltas.subtract(old_batch_keys)
+                        record(deltas)
+            catalogue_changed()
+        return books
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that takes its instances from a ``{pk: instance}``
+    mapping in the serializer context (``context_key``) when the mapping
+    covers the submitted primary key. ``None`` values mark primary keys
+    that were looked up and don't exist. Other keys are looked up as usual.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_pk(self, data):
+        """The primary key ``data`` names, or None if it isn't one."""
+        if isinstance(data, bool):
+            return None
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            return None
+
+    def to_internal_value(self, data):
+        instances = self.context.get(self.context_key)
+        pk = self.to_pk(data)
+        if instances is None or pk is None or pk not in instances:
+            return super().to_internal_value(data)
+        if instances[pk] is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instances[pk]
+
+
+class BookSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Book model.
     
     Includes validation to ensure publication_year is not in the future.
+    For lists, authors are resolved and the current year is computed once
+    for all items (see BookListSerializer.get_validation_context).
+    Reads can be narrowed with ``?fields=``/``?omit=`` (see api.fieldsets).
     """
+    author = PrefetchedPrimaryKeyRelatedField('authors', queryset=Author.objects.all())
+
     class Meta:
         model = Book
         fields = ['id', 'title', 'publication_year', 'author']
+        list_serializer_class = BookListSerializer
     
     def validate_publication_year(self, value):
         """
@@ -25,20 +201,52 @@ class BookSerializer(serializers.ModelSerializer):
         Raises:
             serializers.ValidationError: If the publication year is in the future
         """
-        current_year = datetime.now().year
+        if isinstance(self.parent, BookListSerializer):
+            return value  # Checked for the whole list at once.
+        current_year = self.context.get('current_year') or datetime.now().year
         if value > current_year:
-            raise serializers.ValidationError("Publication year cannot be in the future.")
+            raise serializers.ValidationError(FUTURE_YEAR_MESSAGE)
         return value
 
-class AuthorSerializer(serializers.ModelSerializer):
+class BookIdListSerializer(serializers.Serializer):
+    """Payload of the bulk delete endpoint: ``{"ids": [...]}``."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_ITEMS,
+    )
+
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Author model.
     
     Includes a nested BookSerializer to serialize the author's related books.
     The books field is read-only and dynamically includes all books by the author.
+    Reads can be narrowed with ``?fields=``/``?omit=`` (see api.fieldsets).
     """
     books = BookSerializer(many=True, read_only=True)
     
     class Meta:
         model = Author
-        fields = ['id', 'name', 'books']
\ No newline at end of file
+        fields = ['id', 'name', 'books']
+
+class AuthorBookCountSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Author representation for ``?books=count``: the number of books instead
+    of the nested books. Expects a ``book_count`` annotation on the queryset.
+    """
+    books = serializers.IntegerField(source='book_count', read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'books']
+
+
+class AuthorBookIdsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Author representation for ``?books=ids``: the primary keys of the
+    author's books instead of the nested books.
+    """
+    books = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'books']
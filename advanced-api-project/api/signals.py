@@ -0,0 +1,67 @@
+"""
+Derived data kept in sync with api models.
+
+Every Book or Author write invalidates the cached list queries (see
+``api.querycache``): an author rename changes which books match
+``author__name`` filters and searches. The version is bumped at once and
+again after commit, so a request that read the old rows while the write was
+in flight cannot keep serving them.
+
+Saves also re-index the title or name in the trigram search index (see
+``api.search``); deletes cascade to it. Book saves and deletes adjust the
+materialized counts (see ``api.rollups``).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Author, Book
+from .querycache import invalidate_query_cache
+from .rollups import book_key, record
+from .search import index_authors, index_books
+
+
+def catalogue_changed():
+    invalidate_query_cache()
+    transaction.on_commit(invalidate_query_cache)
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+def model_deleted(sender, **kwargs):
+    catalogue_changed()
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    record({book_key(instance): -1})
+
+
+@receiver(pre_save, sender=Book)
+def book_saving(sender, instance, update_fields=None, **kwargs):
+    # Remember which rollup rows the book counted in before this save.
+    instance._rollup_key = None
+    if instance._state.adding:
+        return
+    if update_fields is None or {'author', 'author_id', 'publication_year'} & set(update_fields):
+        instance._rollup_key = Book.objects.filter(pk=instance.pk).values_list(
+            'author_id', 'publication_year',
+        ).first()
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is None or 'title' in update_fields:
+        index_books([instance], replace=not created)
+    if created:
+        record({book_key(instance): 1})
+    elif instance._rollup_key is not None and instance._rollup_key != book_key(instance):
+        record({instance._rollup_key: -1, book_key(instance): 1})
+    catalogue_changed()
+
+
+@receiver(post_save, sender=Author)
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is None or 'name' in update_fields:
+        index_authors([instance], replace=not created)
+    catalogue_changed()
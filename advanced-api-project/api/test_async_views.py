@@ -0,0 +1,105 @@
+from importlib.util import find_spec
+from urllib.parse import urlsplit
+
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from api.loadtest import PAIRS
+from api.models import Author, Book
+from api.views import BookListView
+
+
+class AsyncViewsTestCase(TestCase):
+    """The async endpoints must return exactly what the DRF endpoints return."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        Author.objects.create(name='No Books Yet')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    async def assertSameResponse(self, sync_name, async_name, params=None, headers=None, **kwargs):
+        sync_response = await self.async_client.get(reverse(sync_name, kwargs=kwargs), params or {}, headers=headers)
+        async_response = await self.async_client.get(reverse(async_name, kwargs=kwargs), params or {}, headers=headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response['Content-Type'], sync_response['Content-Type'])
+        self.assertEqual(async_response.has_header('ETag'), sync_response.has_header('ETag'))
+        self.assertEqual(async_response.get('Last-Modified'), sync_response.get('Last-Modified'))
+        # Pagination links point back at the endpoint that was called.
+        self.assertEqual(async_response.content.replace(b'/api/async/', b'/api/'), sync_response.content)
+
+    async def test_book_list(self):
+        for params in ({}, {'ordering': '-publication_year'}, {'search': 'the'}, {'publication_year': 1937},
+                       {'page_size': 1, 'page': 2}, {'page_size': 1, 'page': 'last'}, {'page': 9},
+                       {'publication_year': 'soon'}):
+            with self.subTest(params=params):
+                await self.assertSameResponse('book-list', 'async-book-list', params)
+
+    async def test_book_list_facets(self):
+        for params in ({'facets': 'author,publication_year'}, {'facets': 'author', 'search': 'the'},
+                       {'facets': 'title'}):
+            with self.subTest(params=params):
+                await self.assertSameResponse('book-list', 'async-book-list', params)
+
+    async def test_negotiated_renderers(self):
+        formats = [{'format': 'columnar'}, {'format': 'json'}]
+        if find_spec('msgpack'):
+            formats.append({'format': 'msgpack'})
+        for params in formats:
+            with self.subTest(params=params):
+                await self.assertSameResponse('book-list', 'async-book-list', params)
+                await self.assertSameResponse('author-detail', 'async-author-detail', params, pk=self.tolkien.pk)
+        for accept in ('application/vnd.columnar+json', 'application/json', '*/*', 'application/xml'):
+            with self.subTest(accept=accept):
+                await self.assertSameResponse('book-list', 'async-book-list', headers={'Accept': accept})
+
+    async def test_browsable_api_is_not_offered(self):
+        await self.assertSameResponse('book-list', 'async-book-list', {'format': 'yaml'})
+        response = await self.async_client.get(reverse('async-book-list'), {'format': 'api'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_conditional_get(self):
+        for name, kwargs in (('async-book-list', {}), ('async-book-detail', {'pk': self.hobbit.pk}),
+                             ('async-author-list', {}), ('async-author-detail', {'pk': self.tolkien.pk})):
+            with self.subTest(name=name):
+                url = reverse(name, kwargs=kwargs)
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                response = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    async def test_book_detail(self):
+        await self.assertSameResponse('book-detail', 'async-book-detail', pk=self.hobbit.pk)
+        await self.assertSameResponse('book-detail', 'async-book-detail', pk=999)
+
+    async def test_author_list(self):
+        for params in ({}, {'books': 'ids'}, {'books': 'count'}, {'search': 'tolkien'}, {'books': 'all'}):
+            with self.subTest(params=params):
+                await self.assertSameResponse('author-list', 'async-author-list', params)
+
+    async def test_author_detail(self):
+        for mode in ('full', 'ids', 'count'):
+            with self.subTest(mode=mode):
+                await self.assertSameResponse('author-detail', 'async-author-detail', {'books': mode},
+                                              pk=self.tolkien.pk)
+        await self.assertSameResponse('author-detail', 'async-author-detail', pk=999)
+
+    async def test_writes_are_not_allowed(self):
+        response = await self.async_client.post(reverse('async-book-list'), {})
+        self.assertEqual(response.status_code, 405)
+
+
+class LoadTestPairsTestCase(TestCase):
+    def test_pairs_resolve_to_sync_and_async_views(self):
+        for pair in PAIRS:
+            sync_url, async_url = pair.urls('http://sync', 'http://async/')
+            with self.subTest(pair=pair.name):
+                self.assertEqual(resolve(urlsplit(async_url).path).url_name,
+                                 'async-' + resolve(urlsplit(sync_url).path).url_name)
@@ -0,0 +1,49 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+class AuthorBooksTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.lotr = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+        cls.list_url = reverse('author-list')
+        cls.detail_url = reverse('author-detail', kwargs={'pk': cls.tolkien.pk})
+
+    def test_list_prefetches_books(self):
+        for number in range(5):
+            author = Author.objects.create(name='Author %d' % number)
+            Book.objects.create(title='Book %d' % number, author=author, publication_year=2000)
+        # One query for the authors and one for all of their books, after
+        # the ETag fingerprint.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_full_books(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['books'], [
+            {'id': self.hobbit.pk, 'title': 'The Hobbit', 'publication_year': 1937, 'author': self.tolkien.pk},
+            {'id': self.lotr.pk, 'title': 'The Lord of the Rings', 'publication_year': 1954, 'author': self.tolkien.pk},
+        ])
+
+    def test_book_ids(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.detail_url, {'books': 'ids'})
+        self.assertEqual(response.data['books'], [self.hobbit.pk, self.lotr.pk])
+
+    def test_book_count(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url, {'books': 'count'})
+        counts = {author['name']: author['books'] for author in response.data}
+        self.assertEqual(counts, {'J.R.R. Tolkien': 2, 'J.K. Rowling': 1})
+
+    def test_invalid_mode(self):
+        response = self.client.get(self.list_url, {'books': 'all'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
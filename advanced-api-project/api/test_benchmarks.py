@@ -0,0 +1,51 @@
+from django.test import TestCase
+
+from api import benchmarks, factories
+from api.models import Author, Book
+
+
+class BenchmarkTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        factories.create_library(authors=20, books=300, seed=1)
+
+    def test_factories_seed_requested_counts(self):
+        self.assertEqual(Author.objects.count(), 20)
+        self.assertEqual(Book.objects.count(), 300)
+        self.assertGreater(Book.objects.values('author').distinct().count(), 1)
+
+    def test_run_reports_every_scenario(self):
+        results = benchmarks.run(iterations=2, warmup=0)
+        self.assertEqual(set(results), {scenario.name for scenario in benchmarks.SCENARIOS})
+        for name, summary in results.items():
+            with self.subTest(scenario=name):
+                self.assertEqual(summary['status'], 200)
+                self.assertGreater(summary['bytes'], 0)
+                self.assertGreaterEqual(summary['queries'], 1)
+                self.assertLessEqual(summary['p50_ms'], summary['p99_ms'])
+                self.assertLessEqual(summary['warm_queries'], summary['queries'])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmarks.percentile(values, 50), 50)
+        self.assertEqual(benchmarks.percentile(values, 99), 99)
+        self.assertEqual(benchmarks.percentile([7], 99), 7)
+
+    def test_compare(self):
+        baseline = {'book-list': {'p50_ms': 10, 'p99_ms': 20, 'queries': 2, 'bytes': 0}}
+        current = {
+            'book-list': {'p50_ms': 5, 'p99_ms': 20, 'queries': 1, 'bytes': 0},
+            'author-list': {'p50_ms': 1, 'p99_ms': 1, 'queries': 1, 'bytes': 1},
+        }
+        rows = {(name, metric): ratio for name, metric, _, _, ratio in benchmarks.compare(baseline, current)}
+        self.assertEqual(rows[('book-list', 'p50_ms')], 0.5)
+        self.assertIsNone(rows[('book-list', 'bytes')])
+        self.assertNotIn(('author-list', 'p50_ms'), rows)
+
+    def test_renderer_sizes(self):
+        results = benchmarks.renderer_sizes(rows=300, iterations=1)
+        self.assertEqual(set(results), {'book-page', 'authors-nested'})
+        for payload, by_renderer in results.items():
+            with self.subTest(payload=payload):
+                self.assertLess(by_renderer['columnar']['bytes'], by_renderer['json']['bytes'])
+                self.assertLess(by_renderer['json']['gzip_bytes'], by_renderer['json']['bytes'])
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.serializers import BookListSerializer, BookSerializer
+
+
+class BookBulkTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='password')
+        cls.admin_user = User.objects.create_superuser(username='admin', password='adminpassword')
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.potter = Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create(self):
+        payload = [
+            {'title': 'Book %d' % number, 'author': self.tolkien.pk, 'publication_year': 1900 + number}
+            for number in range(25)
+        ]
+        response = self.client.post(reverse('book-bulk-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 25)
+        self.assertTrue(all(book['id'] for book in response.data))
+        self.assertEqual(Book.objects.count(), 27)
+
+    def test_bulk_create_batches(self):
+        BookListSerializer.batch_size = 10
+        try:
+            payload = [{'title': 'B%d' % n, 'author': self.rowling.pk, 'publication_year': 2000}
+                       for n in range(25)]
+            # Per batch: SAVEPOINT, INSERT, search index INSERT (in its own
+            # SAVEPOINT/RELEASE), rollup SELECT and UPDATE, RELEASE (the test
+            # case wraps everything in a transaction); plus one author lookup
+            # for all items and one rollup INSERT for the first (author, year),
+            # in a SAVEPOINT/RELEASE so a concurrent insert can be retried.
+            with self.assertNumQueries(1 + 8 * 3 + 3):
+                response = self.client.post(reverse('book-bulk-create'), payload, format='json')
+        finally:
+            BookListSerializer.batch_size = 1000
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        next_year = datetime.now().year + 1
+        payload = [
+            {'title': 'Fine', 'author': self.tolkien.pk, 'publication_year': 2000},
+            {'title': 'Future', 'author': self.tolkien.pk, 'publication_year': next_year},
+            {'author': 999, 'publication_year': next_year},
+        ]
+        response = self.client.post(reverse('book-bulk-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(response.data[1], {'publication_year': ['Publication year cannot be in the future.']})
+        self.assertEqual(set(response.data[2]), {'title', 'author'})
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_bulk_validation_resolves_authors_at_once(self):
+        payload = [
+            {'title': 'Fine', 'author': self.tolkien.pk, 'publication_year': 2000},
+            {'title': 'Also fine', 'author': str(self.rowling.pk), 'publication_year': 2001},
+            {'title': 'Missing', 'author': 999, 'publication_year': 2002},
+            {'title': 'Not a key', 'author': 'tolkien', 'publication_year': 2003},
+        ]
+        serializer = BookSerializer(data=payload, many=True)
+        # One in_bulk lookup for every author, however many items there are.
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors[:2], [{}, {}])
+        self.assertEqual(serializer.errors[2]['author'][0].code, 'does_not_exist')
+        self.assertEqual(serializer.errors[3]['author'][0].code, 'incorrect_type')
+
+    def test_bulk_create_requires_list(self):
+        response = self.client.post(reverse('book-bulk-create'), {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_unauthenticated(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(reverse('book-bulk-create'), [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_update(self):
+        payload = [
+            {'id': self.hobbit.pk, 'title': 'The Hobbit (Revised)'},
+            {'id': self.potter.pk, 'publication_year': 1998},
+        ]
+        response = self.client.patch(reverse('book-bulk-update'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([book['id'] for book in response.data], [self.hobbit.pk, self.potter.pk])
+        self.hobbit.refresh_from_db()
+        self.potter.refresh_from_db()
+        self.assertEqual(self.hobbit.title, 'The Hobbit (Revised)')
+        self.assertEqual(self.hobbit.publication_year, 1937)
+        self.assertEqual(self.potter.publication_year, 1998)
+
+    def test_bulk_update_unknown_and_duplicate_ids(self):
+        payload = [
+            {'id': self.hobbit.pk, 'title': 'A'},
+            {'id': self.hobbit.pk, 'title': 'B'},
+            {'id': 999, 'title': 'C'},
+        ]
+        response = self.client.patch(reverse('book-bulk-update'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('id', response.data[1])
+        self.assertIn('id', response.data[2])
+        self.hobbit.refresh_from_db()
+        self.assertEqual(self.hobbit.title, 'The Hobbit')
+
+    def test_bulk_update_rejects_boolean_ids(self):
+        Book.objects.get_or_create(pk=1, defaults={'title': 'Book one', 'author': self.tolkien})
+        response = self.client.patch(reverse('book-bulk-update'), [{'id': True, 'title': 'A'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data[0])
+        self.assertFalse(Book.objects.filter(title='A').exists())
+
+    def test_bulk_put_requires_full_items(self):
+        response = self.client.put(reverse('book-bulk-update'), [{'id': self.hobbit.pk, 'title': 'A'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('publication_year', response.data[0])
+
+    def test_bulk_delete(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.delete(
+            reverse('book-bulk-delete'), {'ids': [self.hobbit.pk, 999, self.hobbit.pk]}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 1, 'missing': [999]})
+        self.assertFalse(Book.objects.filter(pk=self.hobbit.pk).exists())
+
+    def test_bulk_delete_requires_admin(self):
+        response = self.client.delete(reverse('book-bulk-delete'), {'ids': [self.hobbit.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
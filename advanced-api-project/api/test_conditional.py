@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+class ConditionalGetTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='password')
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.potter = Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+
+    def assertNotModified(self, url, params=None, queries=1):
+        etag = self.client.get(url, params)['ETag']
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def test_not_modified_without_serializing(self):
+        for url in (reverse('book-list'), reverse('book-detail', kwargs={'pk': self.hobbit.pk}),
+                    reverse('author-list'), reverse('author-detail', kwargs={'pk': self.tolkien.pk})):
+            with self.subTest(url=url):
+                self.assertNotModified(url)
+
+    def test_book_update_changes_etag(self):
+        detail_url = reverse('book-detail', kwargs={'pk': self.hobbit.pk})
+        list_etag = self.client.get(reverse('book-list'))['ETag']
+        detail_etag = self.client.get(detail_url)['ETag']
+        self.hobbit.title = 'The Hobbit (Revised)'
+        self.hobbit.save()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'The Hobbit (Revised)')
+        self.assertNotEqual(self.client.get(reverse('book-list'))['ETag'], list_etag)
+
+    def test_delete_changes_list_etag(self):
+        etag = self.client.get(reverse('book-list'))['ETag']
+        self.potter.delete()
+        response = self.client.get(reverse('book-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_parameters(self):
+        url = reverse('book-list')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'ordering': '-title'})['ETag'])
+        url = reverse('author-list')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'books': 'ids'})['ETag'])
+
+    def test_author_etag_follows_books(self):
+        url = reverse('author-detail', kwargs={'pk': self.tolkien.pk})
+        for mode in ('full', 'ids', 'count'):
+            with self.subTest(mode=mode):
+                etag = self.assertNotModified(url, {'books': mode})
+                Book.objects.create(title='Mode %s' % mode, author=self.tolkien, publication_year=1954)
+                response = self.client.get(url, {'books': mode}, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_author_rename_changes_filtered_book_list(self):
+        params = {'search': 'Rowling'}
+        etag = self.client.get(reverse('book-list'), params)['ETag']
+        self.rowling.name = 'Robert Galbraith'
+        self.rowling.save()
+        response = self.client.get(reverse('book-list'), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_if_modified_since(self):
+        url = reverse('book-detail', kwargs={'pk': self.hobbit.pk})
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_last_modified_when_deletes_go_unnoticed(self):
+        for url in (reverse('book-list'), reverse('author-list'),
+                    reverse('author-detail', kwargs={'pk': self.tolkien.pk})):
+            with self.subTest(url=url):
+                self.assertFalse(self.client.get(url).has_header('Last-Modified'))
+
+    def test_list_delete_with_if_modified_since(self):
+        url = reverse('book-list')
+        self.client.get(url)
+        self.potter.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Sat, 01 Jan 2050 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_bulk_update_changes_etag(self):
+        url = reverse('book-detail', kwargs={'pk': self.hobbit.pk})
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.user)
+        self.client.patch(reverse('book-bulk-update'), [{'id': self.hobbit.pk, 'title': 'New'}], format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_book(self):
+        response = self.client.get(reverse('book-detail', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
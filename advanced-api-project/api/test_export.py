@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.views import BookExportView
+
+
+class BookExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        rowling = Author.objects.create(name='J.K. Rowling')
+        Book.objects.create(title='The Hobbit', author=tolkien, publication_year=1937)
+        Book.objects.create(title='The Lord of the Rings', author=tolkien, publication_year=1954)
+        Book.objects.create(title='Harry Potter, "Stone"', author=rowling, publication_year=1997)
+
+    def export(self, export_format, params=None):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': export_format}), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def listed(self, params=None):
+        return json.loads(json.dumps(self.client.get(reverse('book-list'), params).data['results']))
+
+    def test_ndjson_matches_book_list(self):
+        for params in ({}, {'ordering': '-publication_year'}, {'search': 'the'},
+                       {'author__name': 'J.R.R. Tolkien'}):
+            with self.subTest(params=params):
+                response, body = self.export('ndjson', params)
+                self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+                self.assertEqual([json.loads(line) for line in body.splitlines()], self.listed(params))
+
+    def test_csv(self):
+        response, body = self.export('csv', {'ordering': 'publication_year'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="books.csv"')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ['id', 'title', 'publication_year', 'author'])
+        self.assertEqual([row[1] for row in rows[1:]],
+                         ['The Hobbit', 'The Lord of the Rings', 'Harry Potter, "Stone"'])
+
+    def test_streams_in_chunks(self):
+        BookExportView.chunk_size = 2
+        try:
+            response = self.client.get(reverse('book-export', kwargs={'export_format': 'ndjson'}))
+            chunks = list(response.streaming_content)
+        finally:
+            del BookExportView.chunk_size
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [2, 1])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'xml'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_filter(self):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'csv'}),
+                                   {'publication_year': 'soon'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.views import BookListView
+
+
+class BookFacetsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+        Book.objects.create(title='The Casual Vacancy', author=cls.rowling, publication_year=1997)
+        Book.objects.create(title='The Ickabog', author=cls.rowling, publication_year=2020)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def get(self, **params):
+        response = self.client.get(reverse('book-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_no_facets_by_default(self):
+        self.assertNotIn('facets', self.get())
+
+    def test_facets(self):
+        data = self.get(facets='author,publication_year')
+        self.assertEqual(len(data['results']), 5)
+        self.assertEqual(data['facets'], {
+            'author': [
+                {'value': self.rowling.pk, 'count': 3, 'label': 'J.K. Rowling'},
+                {'value': self.tolkien.pk, 'count': 2, 'label': 'J.R.R. Tolkien'},
+            ],
+            'publication_year': [
+                {'value': 1997, 'count': 2},
+                {'value': 1937, 'count': 1},
+                {'value': 1954, 'count': 1},
+                {'value': 2020, 'count': 1},
+            ],
+        })
+
+    def test_facets_follow_filters_and_search(self):
+        data = self.get(facets='publication_year', author__name='J.K. Rowling')
+        self.assertEqual(data['facets'], {'publication_year': [
+            {'value': 1997, 'count': 2}, {'value': 2020, 'count': 1},
+        ]})
+        data = self.get(facets='author', publication_year=1997)
+        self.assertEqual(data['facets']['author'], [
+            {'value': self.rowling.pk, 'count': 2, 'label': 'J.K. Rowling'},
+        ])
+        data = self.get(facets='author', search='the')
+        self.assertEqual([entry['count'] for entry in data['facets']['author']], [2, 2])
+
+    def test_facet_queries(self):
+        with CaptureQueriesContext(connection) as plain:
+            self.get()
+        BookListView.query_cache.clear()
+        # One UNION ALL, or one query per facet where sliced parts can't be combined.
+        facet_queries = 1 if connection.features.supports_slicing_ordering_in_compound else 2
+        for params in ({}, {'search': 'hobbit'}):
+            with self.subTest(params=params), CaptureQueriesContext(connection) as faceted:
+                self.get(facets='author,publication_year', **params)
+            BookListView.query_cache.clear()
+            # The fingerprint also reads the authors' updated_at.
+            self.assertEqual(len(faceted), len(plain) + facet_queries)
+
+    def test_facet_limit_is_applied_by_the_database(self):
+        with mock.patch.object(BookListView, 'facet_limit', 1):
+            for params in ({}, {'search': 'the'}):
+                with self.subTest(params=params), CaptureQueriesContext(connection) as queries:
+                    data = self.get(facets='author,publication_year', **params)
+                BookListView.query_cache.clear()
+                self.assertEqual(len(data['facets']['author']), 1)
+                self.assertEqual(len(data['facets']['publication_year']), 1)
+                facet_sql = [query['sql'] for query in queries if "'publication_year'" in query['sql']]
+                self.assertTrue(facet_sql)
+                self.assertTrue(all('LIMIT 1' in sql for sql in facet_sql))
+        # Ties go to the lowest value, as without a limit.
+        self.assertEqual(data['facets']['author'], [{'value': self.tolkien.pk, 'count': 2, 'label': 'J.R.R. Tolkien'}])
+
+    def test_facets_change_etag(self):
+        plain = self.client.get(reverse('book-list'))
+        faceted = self.client.get(reverse('book-list'), {'facets': 'author'})
+        self.assertNotEqual(plain['ETag'], faceted['ETag'])
+
+    def test_unknown_facet(self):
+        response = self.client.get(reverse('book-list'), {'facets': 'author,title'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('facets', response.data)
@@ -0,0 +1,63 @@
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api.fastpath import get_row_builder
+from api.models import Author, Book
+from api.serializers import AuthorSerializer, BookSerializer
+from api.views import BookListView
+
+
+class FastPathTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        rowling = Author.objects.create(name='J.K. Rowling')
+        Book.objects.create(title='The Hobbit', author=tolkien, publication_year=1937)
+        Book.objects.create(title='The Lord of the Rings', author=tolkien, publication_year=1954)
+        Book.objects.create(title='Harry Potter', author=rowling, publication_year=1997)
+        Book.objects.create(title='Ünïcode “quotes”', author=rowling, publication_year=2001)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def get(self, fast_path, params):
+        BookListView.fast_path = fast_path
+        try:
+            return self.client.get(reverse('book-list'), params)
+        finally:
+            BookListView.fast_path = True
+
+    def test_byte_identical_to_serializer(self):
+        for params in ({}, {'ordering': '-publication_year'}, {'search': 'the'},
+                       {'publication_year': 1997}, {'page_size': 2, 'page': 2}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(True, params).content, self.get(False, params).content)
+
+    def test_single_query_per_page(self):
+        with self.assertNumQueries(3):  # ETag fingerprint + COUNT + page
+            self.client.get(reverse('book-list'))
+
+    def test_row_builder(self):
+        builder = get_row_builder(BookSerializer)
+        self.assertEqual(builder.columns, ('id', 'title', 'publication_year', 'author_id'))
+        rows = Book.objects.order_by('pk').values_list(*builder.columns)
+        books = BookSerializer(Book.objects.order_by('pk'), many=True).data
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(builder.build_many(rows)), renderer.render(books))
+
+    def test_unsupported_serializers(self):
+        class UpperTitleSerializer(BookSerializer):
+            title = serializers.SerializerMethodField()
+
+            def get_title(self, book):
+                return book.title.upper()
+
+        self.assertIsNone(get_row_builder(AuthorSerializer))
+        self.assertIsNone(get_row_builder(UpperTitleSerializer))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('book-list'), {'page_size': 5000})
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(BookListView.pagination_class.max_page_size, 1000)
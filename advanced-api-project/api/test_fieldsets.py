@@ -0,0 +1,104 @@
+import json
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.views import BookListView
+
+
+class SparseFieldsetsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.lotr = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, captured
+
+    def test_book_list_fields(self):
+        response, captured = self.get(reverse('book-list'), fields='title,id')
+        # Serializer order, whatever the order of the parameter.
+        self.assertEqual(response.data['results'], [
+            {'id': self.hobbit.pk, 'title': 'The Hobbit'},
+            {'id': self.lotr.pk, 'title': 'The Lord of the Rings'},
+        ])
+        page_query = captured[-1]['sql']
+        self.assertIn('"title"', page_query)
+        self.assertNotIn('publication_year', page_query)
+
+    def test_book_list_omit(self):
+        response, _ = self.get(reverse('book-list'), omit='id,author')
+        self.assertEqual(response.data['results'][0], {'title': 'The Hobbit', 'publication_year': 1937})
+        # Cached page ids (with a shared cache) are reused whatever fields are selected.
+        response, _ = self.get(reverse('book-list'), fields='publication_year')
+        self.assertEqual(response.data['results'], [{'publication_year': 1937}, {'publication_year': 1954}])
+
+    def test_unknown_fields(self):
+        for param in ('fields', 'omit'):
+            with self.subTest(param=param):
+                response = self.client.get(reverse('book-list'), {param: 'title,isbn'})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data, {
+                    param: 'Must be a comma separated list of: id, title, publication_year, author.',
+                })
+
+    def test_book_detail(self):
+        response, captured = self.get(reverse('book-detail', kwargs={'pk': self.hobbit.pk}), fields='title')
+        self.assertEqual(response.data, {'title': 'The Hobbit'})
+        self.assertNotIn('publication_year', captured[-1]['sql'])
+
+    def test_book_export(self):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'csv'}), {'fields': 'id,title'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,title')
+        self.assertEqual(len(lines), 3)
+
+    def test_author_omit_books(self):
+        response, captured = self.get(reverse('author-list'), omit='books')
+        self.assertEqual(response.data, [{'id': self.tolkien.pk, 'name': 'J.R.R. Tolkien'}])
+        # No prefetch query for the books.
+        self.assertEqual(len(captured), 2)
+
+    def test_author_fields_keep_nested_books(self):
+        response, _ = self.get(reverse('author-detail', kwargs={'pk': self.tolkien.pk}), fields='books')
+        self.assertEqual(list(response.data), ['books'])
+        self.assertEqual(response.data['books'][0], {
+            'id': self.hobbit.pk, 'title': 'The Hobbit', 'publication_year': 1937, 'author': self.tolkien.pk,
+        })
+        response, _ = self.get(reverse('author-list'), fields='name,books', books='count')
+        self.assertEqual(response.data, [{'name': 'J.R.R. Tolkien', 'books': 2}])
+
+    def test_etag_depends_on_fields(self):
+        full, _ = self.get(reverse('book-list'))
+        sparse, _ = self.get(reverse('book-list'), fields='title')
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+
+    def test_writes_ignore_fields(self):
+        self.client.force_authenticate(User.objects.create_user('writer', password='secret'))
+        response = self.client.post(reverse('author-list') + '?fields=name', {'name': 'Ursula K. Le Guin'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data), {'id', 'name', 'books'})
+
+    def test_async_views(self):
+        for name, kwargs, params in [
+            ('book-list', {}, {'fields': 'id,title'}),
+            ('book-detail', {'pk': self.hobbit.pk}, {'omit': 'author'}),
+            ('author-list', {}, {'omit': 'books'}),
+            ('author-detail', {'pk': self.tolkien.pk}, {'fields': 'books', 'books': 'ids'}),
+        ]:
+            with self.subTest(name=name):
+                expected, _ = self.get(reverse(name, kwargs=kwargs), **params)
+                actual, _ = self.get(reverse('async-' + name, kwargs=kwargs), **params)
+                self.assertEqual(json.loads(actual.content), json.loads(expected.content))
@@ -0,0 +1,55 @@
+import re
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Author, Book
+from api.views import BookListView
+
+# A table access in an SQLite plan that does not go through an index.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)(?! USING)\b')
+
+
+class IndexUsageTestCase(TestCase):
+    """
+    EXPLAIN QUERY PLAN checks for the hot list queries: every table they
+    touch must be read through an index, never by a full table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='J.R.R. Tolkien')
+        Book.objects.create(title='The Hobbit', author=author, publication_year=1937)
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN output is SQLite specific')
+
+    def view_queryset(self, view_class, **params):
+        """The queryset a list view would run for ?params, after filtering and ordering."""
+        request = Request(APIRequestFactory().get('/', params))
+        view = view_class(request=request, kwargs={}, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertEqual(FULL_SCAN.findall(plan), [], 'Full table scan in plan:\n%s' % plan)
+
+    def test_book_list_default_ordering(self):
+        self.assertUsesIndex(self.view_queryset(BookListView))
+
+    def test_book_list_ordering(self):
+        for ordering in ('title', '-title', 'publication_year', '-publication_year'):
+            with self.subTest(ordering=ordering):
+                self.assertUsesIndex(self.view_queryset(BookListView, ordering=ordering))
+
+    def test_book_list_filter_by_year(self):
+        self.assertUsesIndex(self.view_queryset(BookListView, publication_year=1937))
+
+    def test_book_list_filter_by_author_name(self):
+        self.assertUsesIndex(self.view_queryset(BookListView, author__name='J.R.R. Tolkien'))
+
+    def test_author_lookup_by_name(self):
+        self.assertUsesIndex(Author.objects.filter(name='J.R.R. Tolkien'))
@@ -0,0 +1,125 @@
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.querycache import LRUCache
+from api.views import BookListView
+
+
+# Version bumps must reach every process: the query cache needs a shared
+# backend and is off with the default LocMemCache.
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='api-test-cache-'),
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class QueryCacheTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='password')
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.lotr = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        cls.potter = Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def titles(self, params=None):
+        return [book['title'] for book in self.client.get(reverse('book-list'), params).data['results']]
+
+    def test_repeated_query_hydrates_by_pk(self):
+        params = {'search': 'the', 'ordering': '-publication_year', 'page_size': 1, 'page': 2}
+        with self.assertNumQueries(3):  # ETag fingerprint, COUNT, page
+            first = self.client.get(reverse('book-list'), params)
+        with self.assertNumQueries(1):  # pk__in
+            second = self.client.get(reverse('book-list'), params)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.data['count'], 2)
+        self.assertIsNotNone(second.data['next'] or second.data['previous'])
+
+    def test_normalized_parameters_share_an_entry(self):
+        self.titles({'search': 'the  hobbit'})
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles({'search': 'the,hobbit', 'page': 1, 'unrelated': 'x'}), ['The Hobbit'])
+        default_order = self.titles()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles({'ordering': 'title'}), default_order)
+
+    def test_ranked_search_and_explicit_ordering_have_their_own_entries(self):
+        Book.objects.create(title='Zzz winterz', author=self.rowling, publication_year=2001)
+        Book.objects.create(title='Aaa winter', author=self.rowling, publication_year=2002)
+        self.assertEqual(self.titles({'search': 'winterz'}), ['Zzz winterz', 'Aaa winter'])
+        self.assertEqual(self.titles({'search': 'winterz', 'ordering': 'title'}), ['Aaa winter', 'Zzz winterz'])
+
+    def test_book_write_invalidates(self):
+        self.assertEqual(self.titles({'publication_year': 1937}), ['The Hobbit'])
+        Book.objects.create(title='Farmer Giles of Ham', author=self.tolkien, publication_year=1937)
+        self.assertEqual(self.titles({'publication_year': 1937}), ['Farmer Giles of Ham', 'The Hobbit'])
+        self.hobbit.delete()
+        self.assertEqual(self.titles({'publication_year': 1937}), ['Farmer Giles of Ham'])
+
+    def test_author_rename_invalidates(self):
+        self.assertEqual(self.titles({'search': 'Rowling'}), ['Harry Potter'])
+        self.rowling.name = 'Robert Galbraith'
+        self.rowling.save()
+        self.assertEqual(self.titles({'search': 'Rowling'}), [])
+
+    def test_bulk_writes_invalidate(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.titles({'publication_year': 2001}), [])
+        self.client.post(reverse('book-bulk-create'), [
+            {'title': 'Bulk', 'author': self.rowling.pk, 'publication_year': 2001},
+        ], format='json')
+        self.assertEqual(self.titles({'publication_year': 2001}), ['Bulk'])
+        self.client.patch(reverse('book-bulk-update'), [
+            {'id': self.potter.pk, 'publication_year': 2001},
+        ], format='json')
+        self.assertEqual(self.titles({'publication_year': 2001}), ['Bulk', 'Harry Potter'])
+
+    def test_lru_bound(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_not_modified_from_cached_fingerprint(self):
+        params = {'publication_year': 1991}
+        etag = self.client.get(reverse('book-list'), params)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('book-list'), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Book.objects.create(title='New', author=self.tolkien, publication_year=1991)
+        response = self.client.get(reverse('book-list'), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_disabled_with_per_process_cache(self):
+        self.titles({'publication_year': 1937})
+        self.assertEqual(len(BookListView.query_cache), 0)
+        with self.assertNumQueries(3):
+            self.titles({'publication_year': 1937})
+
+    def test_entries_expire(self):
+        cache = LRUCache(max_entries=2, ttl=10)
+        with mock.patch('api.querycache.time.monotonic', return_value=100):
+            cache.set('a', 1)
+        with mock.patch('api.querycache.time.monotonic', return_value=109):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('api.querycache.time.monotonic', return_value=110):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
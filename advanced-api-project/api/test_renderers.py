@@ -0,0 +1,106 @@
+import gzip
+import json
+from unittest import skipUnless
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import middleware, renderers
+from api.models import Author, Book
+from api.renderers import to_columns
+from api.views import BookListView
+
+
+class CompactRenderersTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.lotr = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def test_to_columns(self):
+        self.assertEqual(to_columns([{'a': 1, 'b': [{'c': 2}]}, {'a': 3, 'b': []}]),
+                         {'a': [1, 3], 'b': [{'c': [2]}, []]})
+        # Rows with different keys, and everything else, stay as they are.
+        self.assertEqual(to_columns([{'a': 1}, {'b': 2}]), [{'a': 1}, {'b': 2}])
+        self.assertEqual(to_columns({'count': 0, 'results': []}), {'count': 0, 'results': []})
+
+    def test_columnar_book_list(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/vnd.columnar+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.columnar+json')
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['results'], {
+            'id': [self.hobbit.pk, self.lotr.pk],
+            'title': ['The Hobbit', 'The Lord of the Rings'],
+            'publication_year': [1937, 1954],
+            'author': [self.tolkien.pk, self.tolkien.pk],
+        })
+
+    def test_columnar_nested_books(self):
+        response = self.client.get(reverse('author-list'), {'format': 'columnar'})
+        data = json.loads(response.content)
+        self.assertEqual(data['name'], ['J.R.R. Tolkien'])
+        self.assertEqual(data['books'][0]['title'], ['The Hobbit', 'The Lord of the Rings'])
+
+    def test_etag_depends_on_renderer(self):
+        json_response = self.client.get(reverse('book-list'))
+        columnar_response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/vnd.columnar+json')
+        self.assertNotEqual(json_response['ETag'], columnar_response['ETag'])
+        self.assertIn('Accept', json_response['Vary'])
+
+    @skipUnless(renderers.msgpack, 'msgpack is not installed')
+    def test_msgpack(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = renderers.msgpack.unpackb(response.content)
+        self.assertEqual(data['results'][0]['title'], 'The Hobbit')
+
+
+class APICompressionTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='J.R.R. Tolkien')
+        Book.objects.bulk_create([
+            Book(title='Book %d' % number, author=author, publication_year=1900 + number)
+            for number in range(50)
+        ])
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def test_gzip(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 50)
+
+    def test_identity(self):
+        response = self.client.get(reverse('book-list'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json()['count'], 50)
+
+    def test_conditional_get_with_weak_etag(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/'))
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT_ENCODING='gzip',
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_streaming_export(self):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'ndjson'}),
+                                   HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 50)
+
+    @skipUnless(middleware.brotli, 'brotli is not installed')
+    def test_brotli(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(middleware.brotli.decompress(response.content))['count'], 50)
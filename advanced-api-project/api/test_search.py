@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book, BookTitleTrigram
+from api.search import rebuild_index, term_trigrams, trigrams
+from api.views import BookListView
+
+
+class TrigramSearchTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='password')
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        cls.lotr = Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        cls.potter = Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+
+    def setUp(self):
+        BookListView.query_cache.clear()
+
+    def search(self, term, **params):
+        response = self.client.get(reverse('book-list'), {'search': term, **params})
+        return [book['title'] for book in response.data['results']]
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams('Ab c'), {'  a', ' ab', 'ab ', '  c', ' c '})
+        self.assertEqual(term_trigrams('Hobbit'), {'hob', 'obb', 'bbi', 'bit'})
+        self.assertEqual(term_trigrams('of'), set())
+
+    def test_substring_within_word(self):
+        self.assertEqual(self.search('obbi'), ['The Hobbit'])
+        self.assertEqual(self.search('HARRY'), ['Harry Potter'])
+
+    def test_typo_tolerance(self):
+        self.assertEqual(self.search('Hobit'), ['The Hobbit'])
+        self.assertEqual(self.search('Rowlign'), ['Harry Potter'])
+
+    def test_author_name(self):
+        self.assertEqual(self.search('Tolkien'), ['The Hobbit', 'The Lord of the Rings'])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('Tolkien rings'), ['The Lord of the Rings'])
+        self.assertEqual(self.search('Tolkien potter'), [])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.search('of'), ['The Lord of the Rings'])
+
+    def test_exact_matches_rank_first(self):
+        Book.objects.create(title='The Hobbyist', author=self.rowling, publication_year=2001)
+        self.assertEqual(self.search('hobbi'), ['The Hobbit', 'The Hobbyist'])
+        self.assertEqual(self.search('hobbi', ordering='-title'), ['The Hobbyist', 'The Hobbit'])
+
+    def test_index_follows_writes(self):
+        self.hobbit.title = 'There and Back Again'
+        self.hobbit.save()
+        self.assertEqual(self.search('hobbit'), [])
+        self.assertEqual(self.search('again'), ['There and Back Again'])
+        self.rowling.name = 'Robert Galbraith'
+        self.rowling.save()
+        self.assertEqual(self.search('Galbraith'), ['Harry Potter'])
+        self.potter.delete()
+        self.assertFalse(BookTitleTrigram.objects.filter(book_id=self.potter.pk).exists())
+
+    def test_bulk_endpoints_index(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('book-bulk-create'), [
+            {'title': 'Fantastic Beasts', 'author': self.rowling.pk, 'publication_year': 2001},
+        ], format='json')
+        self.assertEqual(self.search('beasts'), ['Fantastic Beasts'])
+        self.client.patch(reverse('book-bulk-update'), [
+            {'id': self.lotr.pk, 'title': 'The Silmarillion'},
+        ], format='json')
+        self.assertEqual(self.search('silmaril'), ['The Silmarillion'])
+
+    def test_rebuild_index(self):
+        BookTitleTrigram.objects.all().delete()
+        self.assertEqual(self.search('hobbit'), [])
+        rebuild_index(batch_size=3)
+        BookListView.query_cache.clear()
+        self.assertEqual(self.search('hobbit'), ['The Hobbit'])
+
+    def test_author_list(self):
+        response = self.client.get(reverse('author-list'), {'search': 'tolkin', 'books': 'count'})
+        self.assertEqual([author['name'] for author in response.data], ['J.R.R. Tolkien'])
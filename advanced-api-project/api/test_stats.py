@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book, BookCountRollup
+from api import rollups
+from api.rollups import rebuild_rollups
+
+
+class BookStatsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(username='admin', password='adminpassword')
+        cls.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        cls.rowling = Author.objects.create(name='J.K. Rowling')
+        cls.hobbit = Book.objects.create(title='The Hobbit', author=cls.tolkien, publication_year=1937)
+        Book.objects.create(title='The Lord of the Rings', author=cls.tolkien, publication_year=1954)
+        Book.objects.create(title='The Silmarillion', author=cls.tolkien, publication_year=1977)
+        Book.objects.create(title='Harry Potter', author=cls.rowling, publication_year=1997)
+        Book.objects.create(title='The Casual Vacancy', author=cls.rowling, publication_year=2012)
+
+    def rollup_rows(self):
+        return sorted(BookCountRollup.objects.values_list('author_id', 'publication_year', 'count'),
+                      key=lambda row: (row[0] or 0, row[1] or 0))
+
+    def assertRollupsConsistent(self):
+        """The incrementally maintained rows equal a full rebuild."""
+        maintained = self.rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(maintained, self.rollup_rows())
+
+    def stats(self, **params):
+        response = self.client.get(reverse('book-stats'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_unfiltered(self):
+        data = self.stats()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(data['publication_years'][0], {'publication_year': 1937, 'count': 1})
+        self.assertEqual(data['decades'], [
+            {'decade': 1930, 'count': 1}, {'decade': 1950, 'count': 1}, {'decade': 1970, 'count': 1},
+            {'decade': 1990, 'count': 1}, {'decade': 2010, 'count': 1},
+        ])
+        self.assertEqual(data['authors'], [
+            {'id': self.tolkien.pk, 'name': 'J.R.R. Tolkien', 'count': 3},
+            {'id': self.rowling.pk, 'name': 'J.K. Rowling', 'count': 2},
+        ])
+
+    def test_filters(self):
+        data = self.stats(author__name='J.K. Rowling')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([year['publication_year'] for year in data['publication_years']], [1997, 2012])
+        self.assertEqual(data['authors'], [{'id': self.rowling.pk, 'name': 'J.K. Rowling', 'count': 2}])
+
+        data = self.stats(publication_year=1954)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['authors'], [{'id': self.tolkien.pk, 'name': 'J.R.R. Tolkien', 'count': 1}])
+
+        self.assertEqual(self.stats(publication_year=1954, author__name='J.K. Rowling')['count'], 0)
+
+    def test_search_counts_matching_books(self):
+        data = self.stats(search='the')
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['authors'][0], {'id': self.tolkien.pk, 'name': 'J.R.R. Tolkien', 'count': 3})
+
+    def test_invalid_filter(self):
+        response = self.client.get(reverse('book-stats'), {'publication_year': 'soon'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filters_read_rollups_only(self):
+        for params in ({}, {'publication_year': 1954}, {'author__name': 'J.K. Rowling'}):
+            with self.subTest(params=params), CaptureQueriesContext(connection) as queries:
+                self.stats(**params)
+            self.assertEqual(len(queries), 2)
+            self.assertFalse(any('"api_book"' in query['sql'] for query in queries))
+
+    def test_rollups_follow_writes(self):
+        self.assertRollupsConsistent()
+        self.hobbit.publication_year = 1938
+        self.hobbit.save()
+        self.assertRollupsConsistent()
+        self.hobbit.author = self.rowling
+        self.hobbit.save()
+        self.assertRollupsConsistent()
+        self.hobbit.delete()
+        self.assertRollupsConsistent()
+        self.tolkien.delete()
+        self.assertRollupsConsistent()
+        self.assertEqual(self.stats()['count'], 2)
+
+    def test_rollups_follow_bulk_writes(self):
+        self.client.force_authenticate(self.admin_user)
+        payload = [{'title': 'B%d' % n, 'author': self.rowling.pk, 'publication_year': 2000 + n % 3}
+                   for n in range(10)]
+        created = self.client.post(reverse('book-bulk-create'), payload, format='json').data
+        self.assertRollupsConsistent()
+
+        payload = [{'id': book['id'], 'author': self.tolkien.pk} for book in created[:4]]
+        self.client.patch(reverse('book-bulk-update'), payload, format='json')
+        self.assertRollupsConsistent()
+
+        ids = [book['id'] for book in created[2:8]] + [self.hobbit.pk]
+        self.client.delete(reverse('book-bulk-delete'), {'ids': ids}, format='json')
+        self.assertRollupsConsistent()
+        self.assertEqual(self.stats()['count'], 8)
+
+    def test_concurrently_inserted_rollup_is_incremented(self):
+        # The SELECT ... FOR UPDATE finds no row, as when another transaction
+        # inserts the same new key before this one does.
+        Book.objects.bulk_create([Book(title='New', author=self.rowling, publication_year=2020)])
+        with mock.patch.object(BookCountRollup.objects, 'select_for_update',
+                               return_value=BookCountRollup.objects.none()):
+            rollups.apply({(self.rowling.pk, 2020): 1})
+            rollups.apply({(self.rowling.pk, 2020): 1})
+        Book.objects.bulk_create([Book(title='Newer', author=self.rowling, publication_year=2020)])
+        self.assertRollupsConsistent()
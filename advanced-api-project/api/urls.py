@@ -1,13 +1,26 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
-    # URL for adding a book
-    path('books/create/', views.add_book, name='add-book'),
-    
-    # URL for editing a book by primary key
-    path('books/update/<int:pk>/', views.edit_book, name='edit-book'),
-    
-    # URL for deleting a book by primary key
-    path('books/delete/<int:pk>/', views.delete_book, name='delete-book'),
+    # Book endpoints
+    path('books/', views.BookListView.as_view(), name='book-list'),
+    path('books/<int:pk>/', views.BookDetailView.as_view(), name='book-detail'),
+    path('books/stats/', views.BookStatsView.as_view(), name='book-stats'),
+    path('books/export.<str:export_format>', views.BookExportView.as_view(), name='book-export'),
+    path('books/create/', views.BookCreateView.as_view(), name='book-create'),
+    path('books/update/<int:pk>/', views.BookUpdateView.as_view(), name='book-update'),
+    path('books/delete/<int:pk>/', views.BookDeleteView.as_view(), name='book-delete'),
+    path('books/bulk/create/', views.BookBulkCreateView.as_view(), name='book-bulk-create'),
+    path('books/bulk/update/', views.BookBulkUpdateView.as_view(), name='book-bulk-update'),
+    path('books/bulk/delete/', views.BookBulkDeleteView.as_view(), name='book-bulk-delete'),
+
+    # Author endpoints
+    path('authors/', views.AuthorListView.as_view(), name='author-list'),
+    path('authors/<int:pk>/', views.AuthorDetailView.as_view(), name='author-detail'),
+
+    # Async read-only variants (see api.async_views)
+    path('async/books/', async_views.AsyncBookListView.as_view(), name='async-book-list'),
+    path('async/books/<int:pk>/', async_views.AsyncBookDetailView.as_view(), name='async-book-detail'),
+    path('async/authors/', async_views.AsyncAuthorListView.as_view(), name='async-author-list'),
+    path('async/authors/<int:pk>/', async_views.AsyncAuthorDetailView.as_view(), name='async-author-detail'),
 ]
@@ -0,0 +1,41 @@
+"""
+Versioned cache namespaces.
+
+Derived data (cached query results) is stored under keys that embed a
+namespace version kept in the default Django cache. Bumping the version
+orphans every entry of the namespace at once, in every process sharing
+that cache. ``LocMemCache`` is private to each process, so a bump there
+never reaches the other workers; ``is_shared()`` tells callers whether
+versions can be relied upon.
+"""
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+VERSION_KEY = 'api:version:%s'
+
+
+def is_shared():
+    """Whether version bumps reach every process (the backend isn't LocMemCache)."""
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def get_version(namespace):
+    key = VERSION_KEY % namespace
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted version never reuses old entries.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(*namespaces):
+    """Invalidate everything cached under the given namespaces."""
+    for namespace in namespaces:
+        try:
+            cache.incr(VERSION_KEY % namespace)
+        except ValueError:
+            # Not seeded yet: the next read starts a fresh version anyway.
+            pass
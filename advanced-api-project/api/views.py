@@ -1,30 +1,95 @@
-from rest_framework import generics
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework import filters
 from django_filters.rest_framework import DjangoFilterBackend
+from . import rollups
+from .conditional import ConditionalGetMixin
+from .export import ExportMixin
+from .facets import FacetMixin
+from .fastpath import FastListMixin
+from .fieldsets import SparseFieldsetMixin
 from .models import Author, Book
+from .pagination import BookPagination
+from .querycache import LRUCache, QueryCacheMixin
+from .search import RankedOrderingFilter, TrigramSearchFilter
 from django_filters import rest_framework
-from .serializers import AuthorSerializer, BookSerializer
+from .serializers import (
+    BULK_MAX_ITEMS, AuthorBookCountSerializer, AuthorBookIdsSerializer, AuthorSerializer,
+    BookIdListSerializer, BookSerializer,
+)
 from rest_framework import permissions # This line is redundant but it's in the previous response, so I'll keep it for now.
 
-class BookListView(generics.ListAPIView):
+class BookFilterMixin:
     """
-    ListView for retrieving all books with filtering and search capabilities.
-    Allows read-only access to all users.
+    Book queryset plus the filter/search/ordering configuration shared by
+    every endpoint that lists books.
     """
-    queryset = Book.objects.all().select_related('author')
+    queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny]  # Anyone can view books
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, RankedOrderingFilter]
     filterset_fields = ['author__name', 'publication_year']
     search_fields = ['title', 'author__name']
     ordering_fields = ['title', 'publication_year']
     ordering = ['title']  # Default ordering
 
-class BookDetailView(generics.RetrieveAPIView):
+    def get_fingerprint_aggregates(self):
+        aggregates = super().get_fingerprint_aggregates()
+        if {'search', 'author__name'} & set(self.request.query_params):
+            # Renaming an author changes which books match.
+            aggregates['author_updated_at'] = Max('author__updated_at')
+        return aggregates
+
+class BookListView(FacetMixin, SparseFieldsetMixin, BookFilterMixin, QueryCacheMixin, ConditionalGetMixin,
+                   FastListMixin, generics.ListAPIView):
+    """
+    ListView for retrieving all books with filtering and search capabilities.
+    Allows read-only access to all users.
+    Facet counts can be requested with ``?facets=`` (see api.facets), and
+    the fields of each book chosen with ``?fields=``/``?omit=`` (see api.fieldsets).
+    Pages are built from plain rows rather than model instances (see api.fastpath),
+    and the ids and fingerprints of recently requested pages are cached
+    when the cache backend is shared (see api.querycache).
+    Supports conditional GETs (see api.conditional).
+    """
+    pagination_class = BookPagination
+    query_cache = LRUCache(max_entries=512, ttl=60)
+
+class BookExportView(SparseFieldsetMixin, BookFilterMixin, ConditionalGetMixin, ExportMixin,
+                     generics.GenericAPIView):
+    """
+    Streams every book matching the BookListView parameters as NDJSON or CSV,
+    without pagination, narrowed by ``?fields=``/``?omit=`` like BookListView.
+    Allows read-only access to all users.
+    """
+    export_filename = 'books'
+
+class BookStatsView(BookFilterMixin, generics.GenericAPIView):
+    """
+    Book counts per publication year, per decade and per author (the
+    ``max_authors`` most prolific ones) for the BookListView filters.
+    Allows read-only access to all users.
+    Read from the materialized rollups (see api.rollups) unless the request
+    searches or filters on something they don't break down.
+    """
+    max_authors = 100
+
+    def get(self, request, *args, **kwargs):
+        # Validates the filters like BookListView does.
+        queryset = self.filter_queryset(self.get_queryset())
+        counts = rollups.view_counts(self, queryset)
+        return Response(rollups.summarize(*counts, max_authors=self.max_authors))
+
+class BookDetailView(SparseFieldsetMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """
     DetailView for retrieving a single book by ID.
     Allows read-only access to all users.
+    Fields can be selected with ``?fields=``/``?omit=`` (see api.fieldsets).
+    Supports conditional GETs (see api.conditional).
     """
     queryset = Book.objects.all().select_related('author')
     serializer_class = BookSerializer
@@ -87,8 +152,144 @@ class BookDeleteView(generics.DestroyAPIView):
         instance.delete()
         # logger.info(f"Book '{instance.title}' deleted by {self.request.user}")
 
+class BookBulkMixin:
+    """
+    Shared configuration of the bulk book endpoints: at most
+    ``bulk_max_items`` items per request, written in batches of
+    ``BookListSerializer.batch_size``.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    bulk_max_items = BULK_MAX_ITEMS
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs['many'] = True
+        kwargs['max_length'] = self.bulk_max_items
+        return super().get_serializer(*args, **kwargs)
+
+class BookBulkCreateView(BookBulkMixin, generics.CreateAPIView):
+    """
+    Creates every book of a JSON array in one request.
+    Restricted to authenticated users only.
+    Responds with the created books, or with a list of per-item errors
+    (``{}`` for valid items) if any item is invalid, in which case
+    nothing is written.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+class BookBulkUpdateView(BookBulkMixin, generics.GenericAPIView):
+    """
+    Updates every book of a JSON array in one request; each item names its
+    book with ``id``. PATCH allows partial items.
+    Restricted to authenticated users only.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def update(self, request, partial=False):
+        serializer = self.get_serializer(self.get_queryset(), data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def put(self, request, *args, **kwargs):
+        return self.update(request)
+
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, partial=True)
+
+class BookBulkDeleteView(generics.GenericAPIView):
+    """
+    Deletes the books listed in ``{"ids": [...]}`` in batched transactions.
+    Restricted to admin users only for safety.
+    Responds with the number of deleted books and the ids that were not found.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookIdListSerializer
+    permission_classes = [permissions.IsAdminUser]
+    batch_size = 1000
+
+    def delete(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+        deleted = set()
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            # Each deleted book sends post_delete; apply their rollup
+            # changes once per batch.
+            with transaction.atomic(), rollups.deferred():
+                queryset = self.get_queryset().filter(pk__in=batch)
+                found = list(queryset.values_list('pk', flat=True))
+                queryset.delete()
+            deleted.update(found)
+        return Response({
+            'deleted': len(deleted),
+            'missing': [pk for pk in ids if pk not in deleted],
+        }, status=status.HTTP_200_OK)
+
+class AuthorBooksMixin:
+    """
+    Loads the books nested in author responses without N+1 queries.
+
+    Clients pick how much of each author's books they need with the
+    ``?books=`` query parameter:
+
+    * ``full`` (default): nested book objects, prefetched in one query
+      loading only the serialized columns.
+    * ``ids``: the book primary keys, prefetched the same way.
+    * ``count``: the number of books, computed by the author query itself.
+
+    When ``?fields=``/``?omit=`` leave ``books`` out (see api.fieldsets),
+    nothing is prefetched or annotated.
+
+    The expansion only applies to reads; writes always respond with the
+    full representation.
+    """
+    books_query_param = 'books'
+    books_modes = {
+        'full': AuthorSerializer,
+        'ids': AuthorBookIdsSerializer,
+        'count': AuthorBookCountSerializer,
+    }
+    default_books_mode = 'full'
+
+    def get_books_mode(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return self.default_books_mode
+        mode = self.request.query_params.get(self.books_query_param, self.default_books_mode)
+        if mode not in self.books_modes:
+            raise ValidationError({
+                self.books_query_param: 'Must be one of: %s.' % ', '.join(self.books_modes),
+            })
+        return mode
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.get_selected_fields()
+        if selected is not None and 'books' not in selected:
+            return queryset
+        mode = self.get_books_mode()
+        if mode == 'count':
+            return queryset.annotate(book_count=Count('books'))
+        if mode == 'ids':
+            books = Book.objects.only('id', 'author_id')
+        else:
+            books = Book.objects.only('id', 'title', 'publication_year', 'author_id')
+        return queryset.prefetch_related(Prefetch('books', queryset=books.order_by('pk')))
+
+    def get_serializer_class(self):
+        return self.books_modes[self.get_books_mode()]
+
+    def get_fingerprint_aggregates(self):
+        # Every mode depends on the authors' books, so they are fingerprinted too.
+        aggregates = super().get_fingerprint_aggregates()
+        aggregates['book_rows'] = Count('books', distinct=True)
+        aggregates['book_rows_updated_at'] = Max('books__updated_at')
+        return aggregates
+
 # Author views for completeness
-class AuthorListView(generics.ListCreateAPIView):
+class AuthorListView(SparseFieldsetMixin, AuthorBooksMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     Combined List and Create view for Authors.
     Anyone can view, but only authenticated users can create authors.
@@ -96,10 +297,11 @@ class AuthorListView(generics.ListCreateAPIView):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [TrigramSearchFilter]
     search_fields = ['name']
 
-class AuthorDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AuthorDetailView(SparseFieldsetMixin, AuthorBooksMixin, ConditionalGetMixin,
+                       generics.RetrieveUpdateDestroyAPIView):
     """
     Combined Retrieve, Update, Delete view for Authors.
     Anyone can view, but only authenticated users can update/delete.
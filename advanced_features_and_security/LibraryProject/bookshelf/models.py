@@ -36,7 +36,7 @@ from django.db import models
 from django.conf import settings
 
 class Book(models.Model):
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, db_index=True)
     author = models.CharField(max_length=100)
     published_date = models.DateField()
     description = models.TextField()
@@ -1,3 +1,39 @@
+import re
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Author, Book, Library
+
+# A table access in an SQLite plan that does not go through an index.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)(?! USING)\b')
+
+
+class IndexUsageTestCase(TestCase):
+    """
+    EXPLAIN QUERY PLAN checks for the name lookups in query_samples.py:
+    every table they touch must be read through an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='Stephen King')
+        book = Book.objects.create(title='The Shining', author=author)
+        Library.objects.create(name='Central Library').books.add(book)
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN output is SQLite specific')
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertEqual(FULL_SCAN.findall(plan), [], 'Full table scan in plan:\n%s' % plan)
+
+    def test_author_by_name(self):
+        self.assertUsesIndex(Author.objects.filter(name='Stephen King'))
+
+    def test_books_by_author_name(self):
+        self.assertUsesIndex(Book.objects.filter(author__name='Stephen King'))
+
+    def test_library_by_name(self):
+        self.assertUsesIndex(Library.objects.filter(name='Central Library'))
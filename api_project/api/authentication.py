@@ -0,0 +1,125 @@
+"""
+Token authentication without a database query per request.
+
+``TokenAuthentication`` looks the token up joined to its user on every
+request. ``CachedTokenAuthentication`` keeps the result in two tiers:
+
+* a bounded in-process LRU whose entries expire after ``local_ttl``
+  seconds, checked first;
+* the shared Django cache (``cache_alias``), entries expiring after
+  ``shared_ttl`` seconds, so other processes benefit from the lookup.
+  The tier is skipped when that cache is a ``LocMemCache``: it would be
+  private to the process, and an invalidation there would never reach
+  the other workers.
+
+Entries are keyed by a hash of the token, never the token itself. Deleting
+a token or saving its user (e.g. deactivating it, or changing ``is_staff``
+or ``is_superuser``) drops the entry from the shared cache and from this
+process's LRU (see ``api.signals``); LRUs of other processes catch up
+within ``local_ttl``. Group and permission assignments are not cached:
+every request gets its own copy of the user, so ModelBackend loads them
+(and keeps its ``_perm_cache``) per request.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.authentication import TokenAuthentication
+
+
+class TTLCache:
+    """A thread-safe LRU mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries=10000, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication caching ``(user, token)`` per token."""
+    local_cache = TTLCache(max_entries=10000, ttl=30)
+    cache_alias = 'default'
+    shared_ttl = 300
+    key_prefix = 'api:auth-token:'
+
+    @classmethod
+    def get_cache_key(cls, key):
+        return cls.key_prefix + hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def get_shared_cache(cls):
+        """The shared cache tier, or None when it isn't shared between processes."""
+        shared_cache = caches[cls.cache_alias]
+        return None if isinstance(shared_cache, LocMemCache) else shared_cache
+
+    @classmethod
+    def invalidate(cls, key):
+        cache_key = cls.get_cache_key(key)
+        cls.local_cache.delete(cache_key)
+        shared_cache = cls.get_shared_cache()
+        if shared_cache is not None:
+            shared_cache.delete(cache_key)
+
+    def authenticate_credentials(self, key):
+        cache_key = self.get_cache_key(key)
+        credentials = self.local_cache.get(cache_key)
+        if credentials is None:
+            shared_cache = self.get_shared_cache()
+            if shared_cache is not None:
+                credentials = shared_cache.get(cache_key)
+            if credentials is None:
+                # Raises AuthenticationFailed for unknown tokens and inactive
+                # users, which are therefore never cached.
+                credentials = super().authenticate_credentials(key)
+                if shared_cache is not None:
+                    shared_cache.set(cache_key, credentials, self.shared_ttl)
+            self.local_cache.set(cache_key, credentials)
+        return self.copy_credentials(credentials)
+
+    def copy_credentials(self, credentials):
+        """
+        A ``(user, token)`` pair of their own for this request: concurrent
+        requests share the cached instances, and per-request state set on
+        the user (ModelBackend's permission caches...) must not leak.
+        """
+        user, token = credentials
+        user = copy.copy(user)
+        token = copy.copy(token)
+        token.user = user
+        return user, token
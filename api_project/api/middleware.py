@@ -0,0 +1,52 @@
+"""
+Compression of API responses.
+
+``APICompressionMiddleware`` compresses the responses of the API routes:
+with brotli when the client accepts ``br`` and the optional ``brotli``
+package is installed, otherwise with gzip (Django's ``GZipMiddleware``).
+Streaming responses are always gzipped chunk by chunk.
+"""
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class APICompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for the routes under ``path_prefix``, preferring brotli
+    when possible. API responses also vary on ``Accept``, which selects the
+    renderer (see api.renderers).
+    """
+    path_prefix = '/api/'
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        if not request.path.startswith(self.path_prefix):
+            return response
+        patch_vary_headers(response, ('Accept',))
+        if brotli is None or response.streaming or response.has_header('Content-Encoding'):
+            return super().process_response(request, response)
+        if not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return super().process_response(request, response)
+        if len(response.content) < 200:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # Like GZipMiddleware: the ETag no longer matches the bytes.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,51 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class BookPagination(PageNumberPagination):
+    """
+    Page-number pagination for book lists. Clients may ask for larger pages
+    with ``?page_size=``, up to ``max_page_size``.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Cursor pagination over ``id``: pages cost the same however deep the
+    client reads, and rows inserted meanwhile don't shift them.
+    """
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class PaginationModeMixin:
+    """
+    GenericAPIView mixin letting clients pick the pagination with
+    ``?pagination=page|cursor``; requests carrying a ``cursor`` use
+    cursor pagination.
+    """
+    pagination_query_param = 'pagination'
+    pagination_classes = {
+        'page': BookPagination,
+        'cursor': BookCursorPagination,
+    }
+    default_pagination = 'page'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            mode = params.get(self.pagination_query_param, self.default_pagination)
+            if 'cursor' in params:
+                mode = 'cursor'
+            if mode not in self.pagination_classes:
+                raise ValidationError({
+                    self.pagination_query_param: 'Must be one of: %s.' % ', '.join(self.pagination_classes),
+                })
+            self._paginator = self.pagination_classes[mode]()
+        return self._paginator
@@ -0,0 +1,63 @@
+"""
+Compact renderers clients can opt into with ``Accept`` (or ``?format=``).
+
+JSON lists of objects repeat every key on every row.
+``ColumnarJSONRenderer`` turns every list of objects sharing the same keys
+into one array per key::
+
+    [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}]
+    -> {"id": [1, 2], "title": ["A", "B"]}
+
+Everything else (pagination envelopes, errors, scalars) is left as is.
+``MessagePackRenderer`` encodes the regular representation as MessagePack;
+it needs the optional ``msgpack`` package.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def to_columns(data):
+    """Recursively replace lists of same-keyed dicts by a dict of columns."""
+    if isinstance(data, dict):
+        return {key: to_columns(value) for key, value in data.items()}
+    if not isinstance(data, (list, tuple)) or not data:
+        return data
+    keys = data[0].keys() if isinstance(data[0], dict) else None
+    if keys is not None and all(isinstance(item, dict) and item.keys() == keys for item in data):
+        columns = {}
+        for key in keys:
+            column = [item[key] for item in data]
+            # Serializer fields are homogeneous: only nested fields recurse.
+            columns[key] = to_columns(column) if isinstance(column[0], (dict, list, tuple)) else column
+        return columns
+    if any(isinstance(item, (dict, list, tuple)) for item in data):
+        return [to_columns(item) for item in data]
+    return data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """JSON with lists of objects laid out as one array per field."""
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columns(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """The regular representation, encoded as MessagePack."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Dates, decimals, UUIDs... as in JSON responses.
+        return msgpack.packb(data, default=JSONEncoder().default, use_bin_type=True)
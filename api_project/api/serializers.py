@@ -1,7 +1,22 @@
 from rest_framework import serializers
 from .models import Book
 
-class BookSerializer(serializers.ModelSerializer):
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin keeping only the fields listed in
+    ``context['fields']`` (see ``views.FieldsQueryMixin``).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
+
+
+class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
-        fields = ['id', 'title', 'author']
\ No newline at end of file
+        fields = ['id', 'title', 'author']
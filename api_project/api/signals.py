@@ -0,0 +1,27 @@
+"""
+Invalidation of the cached token lookups (see ``api.authentication``).
+
+A deleted token must stop authenticating at once, and a saved user may
+have been deactivated or have lost ``is_staff``/``is_superuser``. Group
+and permission assignments (m2m changes, which send no ``post_save``) are
+not part of the cached entries.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import CachedTokenAuthentication
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    CachedTokenAuthentication.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        CachedTokenAuthentication.invalidate(key)
@@ -1,3 +1,186 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
 
-# Create your tests here.
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .authentication import CachedTokenAuthentication, TTLCache
+from .models import Book
+
+
+class CompactResponsesTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='password')
+        Book.objects.bulk_create([Book(title='Book %d' % number, author='Author %d' % number) for number in range(20)])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_json_by_default(self):
+        response = self.client.get(reverse('book-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['title'], 'Book 0')
+
+    def test_columnar(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/vnd.columnar+json')
+        data = json.loads(response.content)['results']
+        self.assertEqual(set(data), {'id', 'title', 'author'})
+        self.assertEqual(len(data['title']), 20)
+
+    def test_gzip(self):
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 20)
+
+
+class BookPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='password')
+        Book.objects.bulk_create([Book(title='Book %d' % number, author='Author') for number in range(25)])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_page_number_pagination(self):
+        for url_name in ('book-list', 'book_all-list'):
+            with self.subTest(url_name=url_name):
+                data = self.client.get(reverse(url_name), {'page_size': 10, 'page': 3}).data
+                self.assertEqual(data['count'], 25)
+                self.assertEqual([book['title'] for book in data['results']], ['Book %d' % n for n in range(20, 25)])
+
+    def test_page_size_is_capped(self):
+        with mock.patch('api.pagination.BookPagination.max_page_size', 5):
+            data = self.client.get(reverse('book-list'), {'page_size': 1000}).data
+        self.assertEqual(len(data['results']), 5)
+
+    def test_cursor_pagination(self):
+        titles = []
+        response = self.client.get(reverse('book_all-list'), {'pagination': 'cursor', 'page_size': 10})
+        while True:
+            self.assertNotIn('count', response.data)
+            titles.extend(book['title'] for book in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(titles, ['Book %d' % n for n in range(25)])
+
+    def test_unknown_pagination(self):
+        response = self.client.get(reverse('book-list'), {'pagination': 'offset'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sparse_fieldset(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(reverse('book-list'), {'fields': 'title'}).data
+        self.assertEqual(data['results'][0], {'title': 'Book 0'})
+        self.assertNotIn('"api_book"."author"', queries[-1]['sql'])
+        book = Book.objects.get(title='Book 3')
+        data = self.client.get(reverse('book_all-detail', args=[book.pk]), {'fields': 'id,author'}).data
+        self.assertEqual(data, {'id': book.pk, 'author': 'Author'})
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('book-list'), {'fields': 'title,isbn'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('isbn', str(response.data['fields']))
+
+
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(),
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class CachedTokenAuthenticationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='password')
+        cls.token = Token.objects.create(user=cls.user)
+        Book.objects.create(title='The Hobbit', author='J.R.R. Tolkien')
+
+    def setUp(self):
+        CachedTokenAuthentication.local_cache.clear()
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def get_books(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('book-list'))
+        token_queries = [query for query in queries if 'authtoken_token' in query['sql']]
+        return response.status_code, len(token_queries)
+
+    def test_lookup_is_cached(self):
+        self.assertEqual(self.get_books(), (200, 1))
+        self.assertEqual(self.get_books(), (200, 0))
+
+    def test_shared_cache_serves_other_processes(self):
+        self.get_books()
+        CachedTokenAuthentication.local_cache.clear()
+        self.assertEqual(self.get_books(), (200, 0))
+
+    def test_deleted_token_is_rejected(self):
+        self.get_books()
+        self.token.delete()
+        self.assertEqual(self.get_books(), (401, 1))
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_books()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_books(), (401, 1))
+
+    def test_shared_tier_is_skipped_on_local_memory_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.get_books()
+            CachedTokenAuthentication.local_cache.clear()
+            self.assertEqual(self.get_books(), (200, 1))
+
+    def test_requests_get_their_own_user(self):
+        authentication = CachedTokenAuthentication()
+        first_user, first_token = authentication.authenticate_credentials(self.token.key)
+        first_user._perm_cache = set()
+        second_user, second_token = authentication.authenticate_credentials(self.token.key)
+        self.assertIsNot(first_user, second_user)
+        self.assertIs(second_token.user, second_user)
+        self.assertEqual(second_user.pk, self.user.pk)
+        self.assertFalse(hasattr(second_user, '_perm_cache'))
+
+    def test_invalid_token_is_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token nope')
+        self.assertEqual(self.get_books(), (401, 1))
+        self.assertEqual(self.get_books(), (401, 1))
+
+    def test_cache_keys_hide_tokens(self):
+        self.assertNotIn(self.token.key, CachedTokenAuthentication.get_cache_key(self.token.key))
+
+
+class TTLCacheTestCase(SimpleTestCase):
+    def test_entries_expire(self):
+        lru = TTLCache(max_entries=10, ttl=30)
+        with mock.patch('api.authentication.time.monotonic', return_value=100):
+            lru.set('a', 1)
+        with mock.patch('api.authentication.time.monotonic', return_value=129):
+            self.assertEqual(lru.get('a'), 1)
+        with mock.patch('api.authentication.time.monotonic', return_value=130):
+            self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        lru = TTLCache(max_entries=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
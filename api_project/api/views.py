@@ -1,12 +1,51 @@
 from django.shortcuts import render
-from rest_framework import generics
+from rest_framework import generics, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
 from .models import Book
+from .pagination import PaginationModeMixin
 from .serializers import BookSerializer
 
-class BookList(generics.ListAPIView):
-    queryset = Book.objects.all()
+
+class FieldsQueryMixin:
+    """
+    Sparse fieldsets for reads: ``?fields=id,title`` serializes only the
+    listed fields and loads only their columns.
+    """
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        value = self.request.query_params.get(self.fields_query_param)
+        if self.request.method not in SAFE_METHODS or not value:
+            return None
+        requested = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        available = self.get_serializer_class().Meta.fields
+        unknown = [name for name in requested if name not in available]
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param: 'Unknown field(s): %s. Choose from: %s.'
+                % (', '.join(unknown), ', '.join(available)),
+            })
+        return requested
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        if requested:
+            # The primary key is always loaded: pagination orders by it.
+            queryset = queryset.only('pk', *(name for name in requested if name != 'id'))
+        return queryset
+
+
+class BookList(PaginationModeMixin, FieldsQueryMixin, generics.ListAPIView):
+    queryset = Book.objects.order_by('id')
     serializer_class = BookSerializer
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
-    serializer_class = BookSerializer
\ No newline at end of file
+class BookViewSet(PaginationModeMixin, FieldsQueryMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.order_by('id')
+    serializer_class = BookSerializer
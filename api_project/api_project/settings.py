@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,12 +38,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'rest_framework'
-    'api'
-    'rest_framework.authtoken'
+    'rest_framework',
+    'api',
+    'rest_framework.authtoken',
 ]
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compresses /api/ responses; keep above middleware reading the body.
+    'api.middleware.APICompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -125,10 +128,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication with cached lookups (see api.authentication).
+        'api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Book lists are paginated (see api.pagination).
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.BookPagination',
+    'PAGE_SIZE': 100,
+    # Compact renderers clients can opt into with Accept (see api.renderers);
+    # MessagePack needs the optional msgpack package.
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ColumnarJSONRenderer',
+        *(['api.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
\ No newline at end of file
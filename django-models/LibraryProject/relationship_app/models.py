@@ -2,7 +2,7 @@ from django.db import models
 
 
 class Author(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     
     def __str__(self):
         return self.name
@@ -15,7 +15,7 @@ class Book(models.Model):
         return self.title
 
 class Library(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     books = models.ManyToManyField(Book)
     
     def __str__(self):
@@ -0,0 +1,51 @@
+# blog/authors.py
+"""
+Cached author header for the user post pages.
+
+UserPostListView only needs an author's id (to filter posts) and a few
+display fields. They are cached per username, together with the author's
+post count from the counter cache, so a warm user page runs a single query:
+the page of posts. ``blog.signals`` drops the entry when the user is saved
+or deleted, and the one of the previous username when the user is renamed.
+Headers are only cached when the cache is shared between processes (see
+``blog.versioning.is_shared()``): a deletion in one process must reach the
+others.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import Http404
+
+from .counters import get_author_post_count
+from .versioning import is_shared
+
+AUTHOR_HEADER_KEY = 'blog:author:%s'
+AUTHOR_HEADER_TIMEOUT = 60 * 10
+HEADER_FIELDS = ('id', 'username', 'first_name', 'last_name', 'date_joined')
+
+
+def load_author(username):
+    """Return an unsaved User carrying the header fields; raise Http404 if unknown."""
+    header = User.objects.filter(username=username).values(*HEADER_FIELDS).first()
+    if header is None:
+        raise Http404('No user named %s.' % username)
+    return User(**header)
+
+
+def get_author_header(username):
+    """
+    Return ``(author, post_count)`` for ``username``, from the cache when warm.
+    ``author`` is a User instance with only HEADER_FIELDS populated.
+    """
+    if not is_shared():
+        author = load_author(username)
+        return author, get_author_post_count(author.pk)
+    header = cache.get(AUTHOR_HEADER_KEY % username)
+    if header is None:
+        author = load_author(username)
+        header = {field: getattr(author, field) for field in HEADER_FIELDS}
+        cache.set(AUTHOR_HEADER_KEY % username, header, AUTHOR_HEADER_TIMEOUT)
+    return User(**header), get_author_post_count(header['id'])
+
+
+def invalidate_author_header(username):
+    cache.delete(AUTHOR_HEADER_KEY % username)
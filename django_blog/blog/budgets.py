@@ -0,0 +1,42 @@
+# blog/budgets.py
+"""
+Query budgets for blog views.
+
+Views declare how many database queries a request may cost with
+``query_budget``. ``render_within_budget()`` runs a view, renders its
+template (where lazy relations such as ``post.author`` are resolved) and
+raises ``QueryBudgetExceeded`` when the view goes over, so an N+1 slipping
+into a view or template fails the test suite instead of production.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared ``query_budget``."""
+
+
+class QueryBudgetMixin:
+    """Declare the maximum number of queries a request to this view may run."""
+    query_budget = None
+
+
+def render_within_budget(view_class, request, **kwargs):
+    """Run ``view_class`` for ``request`` and check it against its budget."""
+    budget = view_class.query_budget
+    if budget is None:
+        raise ValueError('%s does not declare a query_budget.' % view_class.__name__)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = view_class.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+
+    if len(queries) > budget:
+        raise QueryBudgetExceeded(
+            '%s ran %d queries, budget is %d:\n%s' % (
+                view_class.__name__, len(queries), budget,
+                '\n'.join(query['sql'] for query in queries.captured_queries),
+            )
+        )
+    return response
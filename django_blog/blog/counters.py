@@ -0,0 +1,102 @@
+# blog/counters.py
+"""
+Counter cache for Post aggregates.
+
+The list page used to run ``Post.objects.count()`` on every request. Counts
+are now kept in Django's cache framework: the first read after a cache miss
+does the COUNT and stores it, and ``blog.signals`` adjusts the stored value
+with ``incr``/``decr`` whenever a post is created or deleted. A missing key is
+never created by a write, so a cold cache always falls back to a fresh count.
+
+A write that lands while a read is counting would find the key missing
+(its ``incr`` is a no-op) and the read would then store the count from
+before the write. Every write therefore bumps a generation number first;
+a read only keeps the count it stored if no write happened since it
+started counting.
+
+The counts must live in a cache shared by every process (Memcached, Redis,
+the database cache): with the default per-process ``LocMemCache``, each
+worker would only see its own writes, so counts are then read straight
+from the database (see ``blog.versioning.is_shared()``).
+"""
+from django.core.cache import cache
+
+from .models import Post
+from .versioning import is_shared
+
+TOTAL_POSTS_KEY = 'blog:counts:posts'
+AUTHOR_POSTS_KEY = 'blog:counts:posts:author:%s'
+WRITES_KEY = 'blog:counts:writes'
+
+# Counters are self-correcting on expiry; a few minutes bound the drift
+# from manual SQL or QuerySet.update()/bulk_create() (which send no signals).
+COUNTER_TIMEOUT = 60 * 5
+
+
+def _get_or_count(key, queryset):
+    if not is_shared():
+        return queryset.count()
+    count = cache.get(key)
+    if count is None:
+        cache.add(WRITES_KEY, 0, None)
+        started = cache.get(WRITES_KEY)
+        count = queryset.count()
+        cache.add(key, count, COUNTER_TIMEOUT)
+        if cache.get(WRITES_KEY) != started:
+            # A write may have missed the key while we were counting.
+            cache.delete(key)
+    return count
+
+
+def get_total_posts():
+    """Return the total number of posts, served from the cache when warm."""
+    return _get_or_count(TOTAL_POSTS_KEY, Post.objects.all())
+
+
+def get_author_post_count(author_id):
+    """Return the number of posts written by ``author_id``."""
+    return _get_or_count(AUTHOR_POSTS_KEY % author_id, Post.objects.filter(author_id=author_id))
+
+
+def _record_write():
+    try:
+        cache.incr(WRITES_KEY)
+    except ValueError:
+        cache.add(WRITES_KEY, 1, None)
+
+
+def _adjust(key, delta):
+    try:
+        if delta > 0:
+            cache.incr(key, delta)
+        else:
+            cache.decr(key, -delta)
+    except ValueError:
+        # Key not cached (yet): the next read will count from the database.
+        pass
+
+
+def post_added(author_id):
+    """Record a new post by ``author_id``."""
+    _record_write()
+    _adjust(TOTAL_POSTS_KEY, 1)
+    _adjust(AUTHOR_POSTS_KEY % author_id, 1)
+
+
+def post_removed(author_id):
+    """Record the deletion of a post by ``author_id``."""
+    _record_write()
+    _adjust(TOTAL_POSTS_KEY, -1)
+    _adjust(AUTHOR_POSTS_KEY % author_id, -1)
+
+
+def post_moved(old_author_id, new_author_id):
+    """Record a post being reassigned from one author to another."""
+    _record_write()
+    _adjust(AUTHOR_POSTS_KEY % old_author_id, -1)
+    _adjust(AUTHOR_POSTS_KEY % new_author_id, 1)
+
+
+def reset_counters(author_ids=()):
+    """Drop cached counts so they are recounted on the next read."""
+    cache.delete_many([TOTAL_POSTS_KEY] + [AUTHOR_POSTS_KEY % pk for pk in author_ids])
@@ -4,7 +4,23 @@ from django.contrib.auth.models import User
 from django import forms
 from .models import Post  # Import the Post model
 
-# ... (Existing UserRegisterForm and UserUpdateForm remain unchanged) ...
+class CustomUserCreationForm(UserCreationForm):
+    """Registration form: UserCreationForm plus a required email address."""
+    email = forms.EmailField(required=True)
+
+    class Meta(UserCreationForm.Meta):
+        model = User
+        fields = ['username', 'email']
+
+
+class UserUpdateForm(forms.ModelForm):
+    """Form for updating the logged-in user's username and email."""
+    email = forms.EmailField(required=True)
+
+    class Meta:
+        model = User
+        fields = ['username', 'email']
+
 
 class PostForm(forms.ModelForm):
     """Form for creating and updating Post objects."""
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the stored excerpt and word count of existing posts. "
+        "Post.save() keeps them current afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of posts loaded and updated per batch (default: 500).',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every post, not only those without an excerpt.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Post.objects.only('pk', 'content').order_by('pk')
+        if not options['all']:
+            queryset = queryset.filter(excerpt='').exclude(content='')
+
+        updated = 0
+        last_pk = 0
+        while True:
+            # Seek on pk rather than slicing with OFFSET, since updated rows
+            # drop out of the filtered queryset as we go.
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.update_excerpt()
+            Post.objects.bulk_update(batch, ['excerpt', 'word_count'])
+            updated += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write('Updated %d posts...' % updated)
+
+        self.stdout.write(self.style.SUCCESS('Backfilled excerpts for %d posts.' % updated))
@@ -0,0 +1,69 @@
+"""
+Full-text search index for blog posts (see blog/search.py).
+
+SQLite gets an FTS5 virtual table, filled here and then kept in sync by the
+blog.signals receivers; PostgreSQL gets a GIN index over the title/content
+tsvector. (SQLite triggers are deliberately avoided: Django rebuilds tables
+for most ALTERs on SQLite, which drops triggers on blog_post and breaks
+those on auth_user that reference it.)
+Other databases fall back to the icontains backend and need nothing here.
+"""
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, content, author, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO blog_post_fts (rowid, title, content, author)
+    SELECT p.id, p.title, p.content, u.username
+    FROM blog_post p JOIN auth_user u ON u.id = p.author_id
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS blog_post_fts",
+]
+
+POSTGRES_INDEX_NAME = 'blog_post_search_gin'
+
+
+def postgres_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(
+        SearchVector('title', 'content', config='english'),
+        name=POSTGRES_INDEX_NAME,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('blog', 'Post'), postgres_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('blog', 'Post'), postgres_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
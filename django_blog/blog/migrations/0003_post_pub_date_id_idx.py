@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-published_date', '-id'], name='blog_post_pub_date_id_idx'),
+        ),
+    ]
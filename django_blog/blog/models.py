@@ -2,6 +2,33 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.text import Truncator
+
+# Length of the summaries shown on list pages (matches truncatewords:30).
+EXCERPT_WORDS = 30
+
+class PostQuerySet(models.QuerySet):
+    """Query helpers for Post"""
+    
+    def for_listing(self):
+        """
+        Projection used by the list pages: the author is joined in (no query
+        per post for post.author.username) and the large content column is
+        left out in favour of the stored excerpt.
+        """
+        return self.select_related('author').only(
+            'title', 'published_date', 'excerpt', 'word_count', 'author__username',
+        )
+    
+    def by_author(self, author_id):
+        """
+        One author's posts for the user pages. Seeks the (author,
+        published_date, id) index; the author is already known, so the
+        user table is not joined.
+        """
+        return self.filter(author_id=author_id).only(
+            'title', 'published_date', 'excerpt', 'word_count', 'author_id',
+        ).order_by('-published_date', '-id')
 
 class Post(models.Model):
     """
@@ -11,6 +38,11 @@ class Post(models.Model):
     content = models.TextField()
     published_date = models.DateTimeField(default=timezone.now)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Derived from content in save(); backfill with `manage.py backfill_post_excerpts`.
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = PostQuerySet.as_manager()
     
     def __str__(self):
         return self.title
@@ -18,11 +50,34 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse('post-detail', kwargs={'pk': self.pk})
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored author so signals can spot a reassignment"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+        return instance
+    
+    def update_excerpt(self):
+        """Recompute the stored excerpt and word count from content"""
+        self.excerpt = Truncator(self.content).words(EXCERPT_WORDS, truncate=' …')
+        self.word_count = len(self.content.split())
+    
     def save(self, *args, **kwargs):
-        """Set published_date to now if it's the first time being saved"""
+        """Set published_date on first save and keep the excerpt in sync"""
         if not self.published_date:
             self.published_date = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.update_excerpt()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'excerpt', 'word_count'}
         super().save(*args, **kwargs)
     
     class Meta:
-        ordering = ['-published_date']
\ No newline at end of file
+        ordering = ['-published_date']
+        indexes = [
+            # Backs keyset pagination, which seeks on (published_date, pk).
+            models.Index(fields=['-published_date', '-id'], name='blog_post_pub_date_id_idx'),
+            # Same order within one author, for the user post pages.
+            models.Index(fields=['author', '-published_date', '-id'], name='blog_post_author_pub_date_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,85 @@
+# blog/navigation.py
+"""
+Previous/next post navigation for PostDetailView.
+
+Neighbours are defined on the same ``(published_date, pk)`` order as keyset
+pagination, so they are resolved by correlated subqueries that each seek the
+``blog_post_pub_date_id_idx`` index. ``with_neighbours()`` adds them to the
+post's own query, making a cold detail page a single round trip.
+
+Resolved neighbours are then kept in a cached neighbour map. A new, edited
+or deleted post can change the neighbours of others, so every Post write
+bumps the map's version (see ``blog.versioning`` and ``blog.signals``)
+instead of deleting entries. The map is only used when the cache is shared
+between processes; otherwise every detail page resolves its neighbours in
+its own query.
+"""
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from .models import Post
+from .versioning import bump_versions, get_version, is_shared
+
+NEIGHBOURS_NAMESPACE = 'neighbours'
+NEIGHBOURS_KEY = 'blog:neighbours:%s:%s'
+NEIGHBOURS_TIMEOUT = 60 * 60
+
+
+def _older():
+    return Post.objects.filter(
+        published_date__lte=OuterRef('published_date'),
+    ).exclude(
+        published_date=OuterRef('published_date'), pk__gte=OuterRef('pk'),
+    ).order_by('-published_date', '-pk')
+
+
+def _newer():
+    return Post.objects.filter(
+        published_date__gte=OuterRef('published_date'),
+    ).exclude(
+        published_date=OuterRef('published_date'), pk__lte=OuterRef('pk'),
+    ).order_by('published_date', 'pk')
+
+
+def with_neighbours(queryset):
+    """Annotate posts with the pk and title of their previous/next posts."""
+    return queryset.annotate(
+        previous_pk=Subquery(_older().values('pk')[:1]),
+        previous_title=Subquery(_older().values('title')[:1]),
+        next_pk=Subquery(_newer().values('pk')[:1]),
+        next_title=Subquery(_newer().values('title')[:1]),
+    )
+
+
+def get_cached_neighbours(pk):
+    """Return ``(previous, next)`` as ``(pk, title)`` pairs, or None on a miss."""
+    if not is_shared():
+        return None
+    return cache.get(NEIGHBOURS_KEY % (get_version(NEIGHBOURS_NAMESPACE), pk))
+
+
+def cache_neighbours(post):
+    """Store the neighbours of a post annotated by ``with_neighbours()``."""
+    neighbours = (
+        (post.previous_pk, post.previous_title),
+        (post.next_pk, post.next_title),
+    )
+    if is_shared():
+        cache.set(NEIGHBOURS_KEY % (get_version(NEIGHBOURS_NAMESPACE), post.pk), neighbours, NEIGHBOURS_TIMEOUT)
+    return neighbours
+
+
+def invalidate_neighbours():
+    """Orphan every cached neighbour entry by moving to a new map version."""
+    bump_versions(NEIGHBOURS_NAMESPACE)
+
+
+def as_posts(neighbours):
+    """
+    Turn cached ``(pk, title)`` pairs into lightweight Post instances for the
+    template. Only ``pk``, ``title`` and ``get_absolute_url()`` are usable.
+    """
+    return tuple(
+        Post(pk=pk, title=title) if pk is not None else None
+        for pk, title in neighbours
+    )
@@ -0,0 +1,99 @@
+# blog/page_cache.py
+"""
+Full-page cache for the public blog pages.
+
+Anonymous GET requests to the post list (including search and cursor pages),
+post detail and user post pages are answered from rendered HTML stored in
+Django's cache. Keys are built from the path, the normalised query string,
+the authentication state and the versions of the namespaces the page depends
+on:
+
+* ``posts``             - any post write (lists, search, detail neighbours)
+* ``author:<username>`` - writes to that author's posts (user post pages)
+
+``blog.signals`` bumps these versions on every Post save/delete, which covers
+PostCreateView, PostUpdateView and PostDeleteView as well as the admin, and
+when an author's username or name changes.
+Authenticated users, requests with pending messages and responses that set
+a CSRF cookie always bypass the cache, since their HTML is per-visitor.
+The cache is off unless ``CACHES`` is shared between processes (see
+``blog.versioning.is_shared()``).
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .versioning import bump_versions, get_versions, is_shared
+
+POSTS_NAMESPACE = 'posts'
+AUTHOR_NAMESPACE = 'author:%s'
+PAGE_KEY = 'blog:page:%s'
+
+
+def invalidate_post_pages(author_username):
+    """Drop cached pages affected by a write to a post of ``author_username``."""
+    bump_versions(POSTS_NAMESPACE, AUTHOR_NAMESPACE % author_username)
+
+
+class CachedPageMixin:
+    """
+    View mixin serving anonymous GET requests from the page cache.
+
+    Views list the namespaces their HTML depends on in ``get_page_namespaces()``.
+    """
+    page_cache_timeout = None
+
+    def get_page_namespaces(self):
+        return [POSTS_NAMESPACE]
+
+    def get_page_cache_timeout(self):
+        if self.page_cache_timeout is not None:
+            return self.page_cache_timeout
+        return getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 60 * 5)
+
+    def is_page_cacheable(self, request):
+        return (
+            is_shared()
+            and request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and not len(get_messages(request))
+        )
+
+    def get_page_cache_key(self, request):
+        auth_state = 'auth' if request.user.is_authenticated else 'anon'
+        versions = get_versions(*self.get_page_namespaces())
+        query = sorted((key, sorted(values)) for key, values in request.GET.lists())
+        raw = repr((
+            type(self).__name__, sorted(self.kwargs.items()), request.path, query,
+            auth_state, sorted(versions.items()),
+        ))
+        return PAGE_KEY % hashlib.md5(raw.encode()).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                timeout = self.get_page_cache_timeout()
+
+                def store(rendered):
+                    if not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+                        cache.set(key, (rendered.content, rendered['Content-Type']), timeout)
+
+                if hasattr(response, 'add_post_render_callback'):
+                    response.add_post_render_callback(store)
+                else:
+                    store(response)
+        patch_vary_headers(response, ['Cookie'])
+        return response
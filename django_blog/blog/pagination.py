@@ -0,0 +1,119 @@
+# blog/pagination.py
+"""
+Keyset (cursor) pagination for post lists.
+
+OFFSET pagination gets slower the deeper the page and needs a COUNT(*) for
+every request. The keyset mode instead seeks on ``(published_date, pk)``,
+newest first, using the ``blog_post_pub_date_id_idx`` composite index, so
+every page costs a single LIMIT query regardless of its position.
+
+Pages are addressed by an opaque ``?cursor=`` token that encodes the
+direction of travel and the boundary post's sort key.
+"""
+import base64
+import binascii
+
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, post):
+    raw = '%s|%s|%s' % (direction, post.published_date.isoformat(), post.pk)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return ``(direction, published_date, pk)``; raise Http404 if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        direction, published_date, pk = raw.split('|')
+        published_date = parse_datetime(published_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404('Invalid cursor.')
+    if direction not in (NEXT, PREVIOUS) or published_date is None:
+        raise Http404('Invalid cursor.')
+    return direction, published_date, pk
+
+
+class KeysetPage:
+    """Page-like object exposing the cursors of its neighbouring pages."""
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return encode_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            return encode_cursor(PREVIOUS, self.object_list[0])
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin replacing OFFSET pagination with keyset pagination.
+
+    Views can override ``use_keyset_pagination()`` to fall back to the
+    regular page-number paginator, e.g. for relevance-ordered search results.
+    """
+    cursor_kwarg = 'cursor'
+
+    def use_keyset_pagination(self):
+        return True
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        token = self.request.GET.get(self.cursor_kwarg)
+        if token:
+            direction, published_date, pk = decode_cursor(token)
+        else:
+            direction, published_date, pk = NEXT, None, None
+
+        if direction == NEXT:
+            queryset = queryset.order_by('-published_date', '-pk')
+            if published_date is not None:
+                # Written as a range plus an exclusion (rather than an OR)
+                # so the database can range-scan the composite index.
+                queryset = queryset.filter(published_date__lte=published_date).exclude(
+                    published_date=published_date, pk__gte=pk
+                )
+        else:
+            queryset = queryset.order_by('published_date', 'pk').filter(
+                published_date__gte=published_date
+            ).exclude(published_date=published_date, pk__lte=pk)
+
+        posts = list(queryset[:page_size + 1])
+        has_more = len(posts) > page_size
+        posts = posts[:page_size]
+        if direction == NEXT:
+            page = KeysetPage(posts, has_next=has_more, has_previous=token is not None)
+        else:
+            posts.reverse()
+            page = KeysetPage(posts, has_next=True, has_previous=has_more)
+        return (None, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,192 @@
+# blog/search.py
+"""
+Pluggable full-text search for blog posts.
+
+PostListView hands the search box query to ``get_search_backend()`` instead of
+OR-ing ``icontains`` lookups together. The backend is picked from the
+``BLOG_SEARCH_BACKEND`` setting (a dotted path) or, when that is unset, from
+the database vendor:
+
+* SQLite     -> SQLiteFTS5SearchBackend (``blog_post_fts`` virtual table)
+* PostgreSQL -> PostgresSearchBackend (``tsvector`` + GIN index)
+* others     -> IContainsSearchBackend (the original table scan)
+
+The FTS5 table and the Postgres index are created by migration
+``0002_post_search_index``. The FTS5 table is kept in sync by the Post and
+User receivers in ``blog.signals``; writes that send no signals
+(``QuerySet.update()``, ``bulk_create()``, raw SQL) need a ``rebuild()``.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'blog_post_fts'
+
+# Words longer than this are almost certainly junk and only slow MATCH down.
+MAX_TERM_LENGTH = 64
+MAX_TERMS = 16
+
+
+def split_terms(query):
+    """Split a raw search box query into at most MAX_TERMS word terms."""
+    terms = re.findall(r'\w+', query.lower())
+    return [term[:MAX_TERM_LENGTH] for term in terms[:MAX_TERMS]]
+
+
+class BaseSearchBackend:
+    """
+    Interface for post search backends.
+
+    ``search()`` narrows a Post queryset down to the posts matching ``query``
+    and orders them by relevance (best match first).
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    # Index maintenance hooks, called from blog.signals. Backends whose index
+    # the database maintains by itself (or that have none) leave them as no-ops.
+
+    def index_post(self, post_id):
+        """(Re-)index one post from its stored row."""
+
+    def remove_post(self, post_id):
+        """Drop one post from the index."""
+
+    def rename_author(self, author_id, username):
+        """Update the indexed author of an author's posts after a rename."""
+
+    def rebuild(self):
+        """Re-index every post."""
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """
+    Fallback backend: substring match on title, content and author username.
+    Needs no index but scans the whole table, so results are not ranked.
+    """
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(author__username__icontains=query)
+        )
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Search through the ``blog_post_fts`` FTS5 table (rowid == post id).
+
+    Every term is quoted and prefix-matched, so user input can never be
+    interpreted as FTS5 query syntax. Results are ranked by bm25 with the
+    title weighted above the content and the author.
+    """
+    title_weight = 10.0
+    content_weight = 1.0
+    author_weight = 5.0
+
+    def build_match_expression(self, query):
+        """Turn a raw query into an FTS5 MATCH expression (implicit AND)."""
+        return ' '.join('"%s"*' % term for term in split_terms(query))
+
+    def search(self, queryset, query):
+        expression = self.build_match_expression(query)
+        if not expression:
+            return queryset.none()
+        post_table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                '%s.rowid = %s.id' % (FTS_TABLE, post_table),
+                '%s MATCH %%s' % FTS_TABLE,
+            ],
+            params=[expression],
+            select={
+                'search_rank': 'bm25(%s, %%s, %%s, %%s)' % FTS_TABLE,
+            },
+            select_params=[self.title_weight, self.content_weight, self.author_weight],
+        ).order_by('search_rank', '-published_date')
+
+    # Rows are copied from the database rather than from the saved instance,
+    # so partial saves (update_fields, deferred content) index the full post.
+    INDEX_SQL = (
+        "INSERT INTO %s (rowid, title, content, author) "
+        "SELECT p.id, p.title, p.content, u.username "
+        "FROM blog_post p JOIN auth_user u ON u.id = p.author_id" % FTS_TABLE
+    )
+
+    def _reindex(self, where, params):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM %s WHERE rowid IN (SELECT p.id FROM blog_post p WHERE %s)"
+                % (FTS_TABLE, where), params,
+            )
+            cursor.execute("%s WHERE %s" % (self.INDEX_SQL, where), params)
+
+    def index_post(self, post_id):
+        self._reindex('p.id = %s', [post_id])
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM %s WHERE rowid = %%s" % FTS_TABLE, [post_id])
+
+    def rename_author(self, author_id, username):
+        # Only rows whose stored name differs are rewritten, so the common
+        # case (a user saved without renaming) writes nothing.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE %s SET author = %%s WHERE rowid IN "
+                "(SELECT id FROM blog_post WHERE author_id = %%s) AND author != %%s" % FTS_TABLE,
+                [username, author_id, username],
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM %s" % FTS_TABLE)
+            cursor.execute(self.INDEX_SQL)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Search with Postgres ``tsvector``/``tsquery``.
+
+    The vector matches the expression of the GIN index created by migration
+    0002, so the planner can use it. Author usernames are matched exactly,
+    which the unique index on ``auth_user.username`` serves.
+    """
+    config = 'english'
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector,
+        )
+
+        terms = split_terms(query)
+        if not terms:
+            return queryset.none()
+        vector = SearchVector('title', 'content', config=self.config)
+        search_query = SearchQuery(' '.join(terms), config=self.config)
+        return queryset.annotate(
+            search_document=vector,
+            search_rank=SearchRank(vector, search_query),
+        ).filter(
+            Q(search_document=search_query) | Q(author__username=query.strip())
+        ).order_by('-search_rank', '-published_date')
+
+
+VENDOR_BACKENDS = {
+    'sqlite': 'blog.search.SQLiteFTS5SearchBackend',
+    'postgresql': 'blog.search.PostgresSearchBackend',
+}
+
+
+def get_search_backend():
+    """Return the configured search backend instance."""
+    path = getattr(settings, 'BLOG_SEARCH_BACKEND', None)
+    if path is None:
+        path = VENDOR_BACKENDS.get(connection.vendor, 'blog.search.IContainsSearchBackend')
+    return import_string(path)()
@@ -0,0 +1,75 @@
+# blog/signals.py
+"""Signal handlers keeping the blog's derived data in step with Post writes."""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import authors, counters, navigation, page_cache
+from .models import Post
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    loaded_author_id = getattr(instance, '_loaded_author_id', None)
+    moved = not created and loaded_author_id not in (None, instance.author_id)
+
+    # Counter cache
+    if created:
+        counters.post_added(instance.author_id)
+    elif moved:
+        # Post was reassigned (e.g. in the admin): move it between authors.
+        counters.post_moved(loaded_author_id, instance.author_id)
+
+    # Previous/next map and rendered pages
+    navigation.invalidate_neighbours()
+    page_cache.invalidate_post_pages(instance.author.username)
+    if moved:
+        for username in User.objects.filter(pk=loaded_author_id).values_list('username', flat=True):
+            page_cache.invalidate_post_pages(username)
+
+    # Search index
+    if not raw:
+        get_search_backend().index_post(instance.pk)
+
+    instance._loaded_author_id = instance.author_id
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    counters.post_removed(instance.author_id)
+    navigation.invalidate_neighbours()
+    page_cache.invalidate_post_pages(instance.author.username)
+    get_search_backend().remove_post(instance.pk)
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    # A rename must also drop what is cached under the previous username.
+    instance._previous_username = (
+        User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    previous_username = instance.__dict__.pop('_previous_username', None)
+    if created or raw:
+        return
+    if update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields):
+        return  # e.g. last_login on every sign-in
+    for username in {instance.username, previous_username} - {None}:
+        authors.invalidate_author_header(username)
+        # Every post list and detail page shows its author's @username.
+        page_cache.invalidate_post_pages(username)
+    # Author usernames are searchable, so re-index a renamed author's posts.
+    get_search_backend().rename_author(instance.pk, instance.username)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    authors.invalidate_author_header(instance.username)
@@ -1,3 +1,473 @@
-from django.test import TestCase
+import re
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from django.template.defaultfilters import truncatewords
+from django.views.generic import ListView
+
+from . import counters
+from .models import Post
+from .pagination import KeysetPaginationMixin
+from .budgets import QueryBudgetExceeded, render_within_budget
+from .views import PostDetailView, PostListView, UserPostListView
+from .navigation import with_neighbours
+from .search import IContainsSearchBackend, SQLiteFTS5SearchBackend, get_search_backend, split_terms
+
+
+# Version bumps must reach every process: the caches need a shared backend
+# and are off with the default LocMemCache.
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='blog-test-cache-'),
+    },
+}
+
+
+class SearchBackendTestCase(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='password')
+        self.bob = User.objects.create_user(username='bob', password='password')
+        now = timezone.now()
+        self.django_post = Post.objects.create(
+            title='Django tips', content='Querysets are lazy.', author=self.alice,
+            published_date=now,
+        )
+        self.python_post = Post.objects.create(
+            title='Python tricks', content='A few notes on Django signals.', author=self.bob,
+            published_date=now - timezone.timedelta(days=1),
+        )
+
+    def test_split_terms_drops_query_syntax(self):
+        """FTS operators and quotes in user input are reduced to plain words."""
+        self.assertEqual(split_terms('django" OR (NEAR*'), ['django', 'or', 'near'])
+
+    def test_icontains_backend(self):
+        results = IContainsSearchBackend().search(Post.objects.all(), 'bob')
+        self.assertEqual(list(results), [self.python_post])
+
+    def test_fts_ranks_title_matches_first(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 backend is SQLite only')
+        results = SQLiteFTS5SearchBackend().search(Post.objects.all(), 'django')
+        self.assertEqual(list(results), [self.django_post, self.python_post])
+
+    def test_fts_index_follows_writes(self):
+        """Signal receivers keep the FTS table in sync with updates, deletes and renames."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 backend is SQLite only')
+        backend = SQLiteFTS5SearchBackend()
+        self.python_post.title = 'Generators explained'
+        self.python_post.save()
+        self.assertEqual(list(backend.search(Post.objects.all(), 'generat')), [self.python_post])
+
+        self.bob.username = 'robert'
+        self.bob.save()
+        self.assertEqual(list(backend.search(Post.objects.all(), 'robert')), [self.python_post])
+
+        self.python_post.delete()
+        self.assertEqual(list(backend.search(Post.objects.all(), 'generators')), [])
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class PostCounterTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', password='password')
+        self.bob = User.objects.create_user(username='bob', password='password')
+        Post.objects.create(title='First', content='...', author=self.alice)
+
+    def test_counts_are_served_from_cache(self):
+        self.assertEqual(counters.get_total_posts(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_total_posts(), 1)
+
+    def test_writes_update_cached_counts(self):
+        self.assertEqual(counters.get_total_posts(), 1)
+        self.assertEqual(counters.get_author_post_count(self.alice.pk), 1)
+        self.assertEqual(counters.get_author_post_count(self.bob.pk), 0)
+
+        post = Post.objects.create(title='Second', content='...', author=self.alice)
+        post = Post.objects.get(pk=post.pk)
+        post.author = self.bob
+        post.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_total_posts(), 2)
+            self.assertEqual(counters.get_author_post_count(self.alice.pk), 1)
+            self.assertEqual(counters.get_author_post_count(self.bob.pk), 1)
+
+        post.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_total_posts(), 1)
+            self.assertEqual(counters.get_author_post_count(self.bob.pk), 0)
+
+
+    def test_write_during_count_is_not_lost(self):
+        class CountThenWrite:
+            def count(inner):
+                count = Post.objects.count()
+                # Lands after the COUNT, while the key is still missing.
+                Post.objects.create(title='Concurrent', content='...', author=self.bob)
+                return count
+
+        self.assertEqual(counters._get_or_count(counters.TOTAL_POSTS_KEY, CountThenWrite()), 1)
+        self.assertIsNone(cache.get(counters.TOTAL_POSTS_KEY))
+        self.assertEqual(counters.get_total_posts(), 2)
+
+    def test_counts_are_not_cached_per_process(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual(counters.get_total_posts(), 1)
+            with self.assertNumQueries(1):
+                self.assertEqual(counters.get_total_posts(), 1)
+
+
+class KeysetPaginationTestCase(TestCase):
+    class PostKeysetView(KeysetPaginationMixin, ListView):
+        model = Post
+        paginate_by = 2
+
+    def setUp(self):
+        author = User.objects.create_user(username='alice', password='password')
+        now = timezone.now()
+        # Two posts share a timestamp to exercise the pk tie-breaker.
+        dates = [now, now, now - timezone.timedelta(days=1),
+                 now - timezone.timedelta(days=2), now - timezone.timedelta(days=3)]
+        self.posts = [
+            Post.objects.create(title='Post %d' % i, content='...', author=author, published_date=date)
+            for i, date in enumerate(dates)
+        ]
+        self.expected = sorted(self.posts, key=lambda p: (p.published_date, p.pk), reverse=True)
+
+    def get_page(self, cursor=None):
+        request = RequestFactory().get('/', {'cursor': cursor} if cursor else {})
+        view = self.PostKeysetView()
+        view.setup(request)
+        _, page, posts, _ = view.paginate_queryset(Post.objects.all(), view.paginate_by)
+        return page, posts
+
+    def test_walk_forward_and_back(self):
+        page, posts = self.get_page()
+        self.assertEqual(posts, self.expected[:2])
+        self.assertFalse(page.has_previous())
+
+        page, posts = self.get_page(page.next_cursor)
+        self.assertEqual(posts, self.expected[2:4])
+
+        last_page, posts = self.get_page(page.next_cursor)
+        self.assertEqual(posts, self.expected[4:])
+        self.assertFalse(last_page.has_next())
+
+        page, posts = self.get_page(last_page.previous_cursor)
+        self.assertEqual(posts, self.expected[2:4])
+        page, posts = self.get_page(page.previous_cursor)
+        self.assertEqual(posts, self.expected[:2])
+        self.assertFalse(page.has_previous())
+
+    def test_deep_page_is_a_single_query(self):
+        page, _ = self.get_page()
+        with self.assertNumQueries(1):
+            self.get_page(page.next_cursor)
+
+    def test_invalid_cursor_is_404(self):
+        with self.assertRaises(Http404):
+            self.get_page('not-a-cursor')
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class PostDetailNavigationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create_user(username='alice', password='password')
+        now = timezone.now()
+        self.older = Post.objects.create(
+            title='Older', content='...', author=author, published_date=now - timezone.timedelta(days=1))
+        self.post = Post.objects.create(title='Middle', content='...', author=author, published_date=now)
+        self.newer = Post.objects.create(
+            title='Newer', content='...', author=author, published_date=now + timezone.timedelta(days=1))
+
+    def get_object(self, pk):
+        view = PostDetailView()
+        view.setup(RequestFactory().get('/'), pk=pk)
+        return view.get_object()
+
+    def test_post_and_neighbours_in_one_query(self):
+        with self.assertNumQueries(1):
+            post = self.get_object(self.post.pk)
+            self.assertEqual(post.author.username, 'alice')
+        self.assertEqual((post.previous_post.pk, post.previous_post.title), (self.older.pk, 'Older'))
+        self.assertEqual((post.next_post.pk, post.next_post.title), (self.newer.pk, 'Newer'))
+
+        oldest = self.get_object(self.older.pk)
+        self.assertIsNone(oldest.previous_post)
+
+    def test_neighbour_map_is_invalidated_by_writes(self):
+        self.get_object(self.post.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_object(self.post.pk).next_post.pk, self.newer.pk)
+
+        self.newer.delete()
+        self.assertIsNone(self.get_object(self.post.pk).next_post)
+
+    def test_neighbour_map_is_off_with_per_process_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.get_object(self.post.pk)
+            with self.assertNumQueries(1):
+                post = self.get_object(self.post.pk)
+            self.assertEqual(post.next_post.pk, self.newer.pk)
+            self.assertEqual(post.__dict__.get('next_pk'), self.newer.pk)
+
+
+class QueryBudgetTestCase(TestCase):
+    """Every public view must render within its declared query budget."""
+
+    def setUp(self):
+        cache.clear()
+        self.authors = [
+            User.objects.create_user(username='author%d' % i, password='password') for i in range(5)
+        ]
+        for i in range(10):
+            Post.objects.create(
+                title='Post %d' % i, content='word ' * 500, author=self.authors[i % 5],
+            )
+
+    def get(self, path='/', **params):
+        request = RequestFactory().get(path, params)
+        request.user = AnonymousUser()
+        return request
+
+    def test_post_list(self):
+        response = render_within_budget(PostListView, self.get())
+        self.assertContains(response, '@author0')
+
+    def test_post_list_search(self):
+        render_within_budget(PostListView, self.get(search='post'))
+
+    def test_user_posts(self):
+        render_within_budget(UserPostListView, self.get(), username='author1')
+
+    def test_post_detail(self):
+        render_within_budget(PostDetailView, self.get(), pk=Post.objects.first().pk)
+
+    def test_list_projection_skips_content(self):
+        post = Post.objects.for_listing().first()
+        self.assertIn('content', post.get_deferred_fields())
+        self.assertEqual(post.excerpt, truncatewords('word ' * 500, 30))
+        self.assertEqual(post.word_count, 500)
+
+    def test_budget_is_enforced(self):
+        class GreedyView(PostListView):
+            def get_queryset(self):
+                return Post.objects.all()  # no select_related: one query per author
+
+        GreedyView.query_budget = PostListView.query_budget
+        with self.assertRaises(QueryBudgetExceeded):
+            render_within_budget(GreedyView, self.get())
+
+
+class PostExcerptTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='alice', password='password')
+
+    def test_save_keeps_excerpt_in_sync(self):
+        post = Post.objects.create(title='Post', content='one two three', author=self.author)
+        self.assertEqual((post.excerpt, post.word_count), ('one two three', 3))
+
+        post.content = ' '.join(str(i) for i in range(40))
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, truncatewords(post.content, 30))
+        self.assertEqual(post.word_count, 40)
+
+    def test_backfill_command(self):
+        post = Post.objects.create(title='Post', content='alpha beta gamma', author=self.author)
+        Post.objects.filter(pk=post.pk).update(excerpt='', word_count=0)
+
+        call_command('backfill_post_excerpts', batch_size=1, stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count), ('alpha beta gamma', 3))
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class PageCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='alice', password='password')
+        self.post = Post.objects.create(title='Cached post', content='...', author=self.author)
+
+    def get(self, view_class, user=None, **kwargs):
+        request = RequestFactory().get('/')
+        request.user = user or AnonymousUser()
+        response = view_class.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_anonymous_pages_are_served_from_cache(self):
+        first = self.get(PostListView)
+        with self.assertNumQueries(0):
+            second = self.get(PostListView)
+        self.assertEqual(first.content, second.content)
+
+        with self.assertNumQueries(1):
+            self.get(PostDetailView, pk=self.post.pk)
+        with self.assertNumQueries(0):
+            self.get(PostDetailView, pk=self.post.pk)
+
+    def test_post_writes_invalidate_cached_pages(self):
+        self.get(PostListView)
+        self.get(UserPostListView, username='alice')
+        Post.objects.create(title='Fresh post', content='...', author=self.author)
+
+        self.assertContains(self.get(PostListView), 'Fresh post')
+        self.assertContains(self.get(UserPostListView, username='alice'), 'Fresh post')
+
+    def test_other_authors_pages_survive_writes(self):
+        bob = User.objects.create_user(username='bob', password='password')
+        self.get(UserPostListView, username='alice')
+        Post.objects.create(title='By bob', content='...', author=bob)
+        with self.assertNumQueries(0):
+            self.get(UserPostListView, username='alice')
+
+    def test_username_change_invalidates_cached_pages(self):
+        self.assertContains(self.get(PostListView), '@alice')
+        self.assertContains(self.get(PostDetailView, pk=self.post.pk), '@alice')
+        self.author.username = 'alicia'
+        self.author.save()
+        self.assertContains(self.get(PostListView), '@alicia')
+        self.assertContains(self.get(PostDetailView, pk=self.post.pk), '@alicia')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.get(PostListView)
+        with self.assertNumQueries(1):
+            self.get(PostListView, user=self.author)
+
+    def test_disabled_with_per_process_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.get(PostListView)
+            with self.assertNumQueries(2):  # page of posts, post count
+                self.get(PostListView)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class UserPostListViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='alice', password='password')
+        self.reader = User.objects.create_user(username='reader', password='password')
+        for i in range(3):
+            Post.objects.create(title='Post %d' % i, content='...', author=self.author)
+
+    def get(self, username):
+        # Signed in, so the page cache is bypassed and the view itself runs.
+        request = RequestFactory().get('/')
+        request.user = self.reader
+        response = UserPostListView.as_view()(request, username=username)
+        response.render()
+        return response
+
+    def test_warm_author_header_leaves_one_query(self):
+        response = self.get('alice')
+        self.assertEqual(response.context_data['author_post_count'], 3)
+        with self.assertNumQueries(1):
+            self.get('alice')
+
+    def test_author_header_is_off_with_per_process_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.get('alice')
+            with self.assertNumQueries(3):  # user lookup, post count, page of posts
+                self.get('alice')
+
+    def test_renamed_user_is_404_under_the_old_username(self):
+        self.get('alice')
+        self.assertEqual(self.client.get('/user/alice/').status_code, 200)
+        self.author.username = 'alicia'
+        self.author.save()
+        with self.assertRaises(Http404):
+            self.get('alice')
+        self.assertEqual(self.client.get('/user/alice/').status_code, 404)
+        self.assertEqual(self.get('alicia').context_data['profile_user'].username, 'alicia')
+
+    def test_unknown_user_is_404(self):
+        with self.assertRaises(Http404):
+            self.get('nobody')
+
+    def test_posts_query_uses_author_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite specific')
+        plan = Post.objects.by_author(self.author.pk)[:5].explain()
+        self.assertIn('blog_post_author_pub_date_idx', plan)
+
+
+class IndexUsageTestCase(TestCase):
+    """EXPLAIN QUERY PLAN checks: hot view queries never fall back to a table scan."""
+    # A table access not served by an index (FTS5 tables are their own index).
+    FULL_SCAN = re.compile(r'\bSCAN (\w+)(?! USING| VIRTUAL TABLE)\b')
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN output is SQLite specific')
+        cache.clear()
+        self.author = User.objects.create_user(username='alice', password='password')
+        self.post = Post.objects.create(title='Indexed', content='...', author=self.author)
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertEqual(self.FULL_SCAN.findall(plan), [], 'Full table scan in plan:\n%s' % plan)
+
+    def test_post_list_pages(self):
+        listing = Post.objects.for_listing().order_by('-published_date', '-pk')
+        self.assertUsesIndex(listing[:6])
+        self.assertUsesIndex(
+            listing.filter(published_date__lte=self.post.published_date).exclude(
+                published_date=self.post.published_date, pk__gte=self.post.pk)[:6]
+        )
+
+    def test_post_search(self):
+        self.assertUsesIndex(get_search_backend().search(Post.objects.for_listing(), 'indexed')[:5])
+
+    def test_post_detail_with_neighbours(self):
+        self.assertUsesIndex(with_neighbours(Post.objects.select_related('author')).filter(pk=self.post.pk))
+
+    def test_user_posts(self):
+        self.assertUsesIndex(Post.objects.by_author(self.author.pk)[:6])
+
+
+class PostFormPagesTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='alice', password='password')
+        self.client.force_login(self.author)
+
+    def test_create_page(self):
+        response = self.client.get('/post/new/')
+        self.assertContains(response, 'New Post')
+        self.assertContains(response, 'name="content"')
+
+        response = self.client.post('/post/new/', {'title': 'Fresh post', 'content': 'Some words'})
+        post = Post.objects.get(title='Fresh post')
+        self.assertRedirects(response, post.get_absolute_url())
+        self.assertEqual(post.author, self.author)
+
+    def test_update_page(self):
+        post = Post.objects.create(title='Draft', content='...', author=self.author)
+        self.assertContains(self.client.get('/post/%d/update/' % post.pk), 'Edit Post')
+
+    def test_delete_page(self):
+        post = Post.objects.create(title='Doomed post', content='...', author=self.author)
+        response = self.client.get('/post/%d/delete/' % post.pk)
+        self.assertContains(response, '<strong>"Doomed post"</strong>', html=True)
+
+        self.assertRedirects(self.client.post('/post/%d/delete/' % post.pk), '/')
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+
+    def test_account_pages(self):
+        self.assertContains(self.client.get('/profile/'), 'Profile Info')
+        self.client.logout()
+        self.assertContains(self.client.get('/login/'), 'Log In')
+        self.assertContains(self.client.get('/register/'), 'Join Today')
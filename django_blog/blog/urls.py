@@ -19,6 +19,9 @@ urlpatterns = [
     
     # Delete View (accessible only to author via UserPassesTestMixin)
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post-delete'),
+    
+    # Posts by one author
+    path('user/<str:username>/', views.UserPostListView.as_view(), name='user-posts'),
 
     # --- Existing Authentication URLs ---
     path('register/', views.register, name='register'),
@@ -0,0 +1,53 @@
+# blog/versioning.py
+"""
+Versioned cache namespaces.
+
+Rather than deleting cache entries one by one, derived data (neighbour map,
+rendered pages) is stored under keys that embed a namespace version. Bumping
+the version orphans every entry of the namespace at once; the orphans simply
+expire.
+
+A bump only reaches the processes sharing the cache. ``LocMemCache`` (the
+default when ``CACHES`` isn't set) is private to each process, so callers
+check ``is_shared()`` and skip their cache when it returns False.
+"""
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+VERSION_KEY = 'blog:version:%s'
+
+
+def is_shared():
+    """Whether version bumps reach every process (the backend isn't LocMemCache)."""
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def get_versions(*namespaces):
+    """Return ``{namespace: version}`` with a single cache round trip."""
+    keys = {VERSION_KEY % namespace: namespace for namespace in namespaces}
+    found = cache.get_many(keys)
+    versions = {}
+    for key, namespace in keys.items():
+        version = found.get(key)
+        if version is None:
+            # Seed from the clock so an evicted version never reuses old entries.
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions[namespace] = version
+    return versions
+
+
+def get_version(namespace):
+    return get_versions(namespace)[namespace]
+
+
+def bump_versions(*namespaces):
+    """Invalidate everything cached under the given namespaces."""
+    for namespace in namespaces:
+        try:
+            cache.incr(VERSION_KEY % namespace)
+        except ValueError:
+            # Not seeded yet: the next read starts a fresh version anyway.
+            pass
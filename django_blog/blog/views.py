@@ -1,89 +1,130 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.generic import (
     ListView, DetailView, CreateView, UpdateView, DeleteView
 )
-from django.contrib.auth.models import User
-from django.db.models import Q
-from .models import Post, UserProfile
-from .forms import PostForm, CustomUserCreationForm, UserUpdateForm, ProfileUpdateForm
+from django.utils.functional import cached_property
+from .models import Post
+from .forms import PostForm, CustomUserCreationForm, UserUpdateForm
+from .search import get_search_backend
+from .counters import get_author_post_count, get_total_posts
+from .authors import get_author_header, load_author
+from .pagination import KeysetPaginationMixin
+from .navigation import as_posts, cache_neighbours, get_cached_neighbours, with_neighbours
+from .budgets import QueryBudgetMixin
+from .page_cache import AUTHOR_NAMESPACE, CachedPageMixin
 
-class PostListView(ListView):
+class PostListView(CachedPageMixin, QueryBudgetMixin, KeysetPaginationMixin, ListView):
     """
     Display a list of all blog posts with pagination and search functionality.
     Accessible to all users (authenticated and anonymous).
+    Browsing uses keyset (cursor) pagination; search results are ranked, so
+    they keep page-number pagination.
     """
     model = Post
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
     paginate_by = 5
     ordering = ['-published_date']
+    # Page of posts, plus the paginator COUNT for search results and the
+    # total post count on a cold counter cache.
+    query_budget = 3
     
     def get_queryset(self):
-        """Add search functionality to the post list"""
-        queryset = super().get_queryset()
-        search_query = self.request.GET.get('search', '')
+        """Add search functionality to the post list (ranked, best match first)"""
+        queryset = super().get_queryset().for_listing()
+        search_query = self.request.GET.get('search', '').strip()
         
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(content__icontains=search_query) |
-                Q(author__username__icontains=search_query)
-            )
+            queryset = get_search_backend().search(queryset, search_query)
         
         return queryset
     
+    def use_keyset_pagination(self):
+        """Relevance-ordered search results cannot seek on published_date"""
+        return not self.request.GET.get('search', '').strip()
+    
     def get_context_data(self, **kwargs):
         """Add additional context data"""
         context = super().get_context_data(**kwargs)
         context['search_query'] = self.request.GET.get('search', '')
-        context['total_posts'] = Post.objects.count()
+        context['total_posts'] = get_total_posts()
         return context
 
-class UserPostListView(ListView):
+class UserPostListView(CachedPageMixin, QueryBudgetMixin, KeysetPaginationMixin, ListView):
     """
-    Display posts by a specific user.
+    Display posts by a specific user, newest first, with cursor pagination.
+    The user is resolved once per request (from the cached author header
+    when cache_author_header is on), and posts are read through the
+    (author, published_date) index without joining the user table.
     """
     model = Post
     template_name = 'blog/user_posts.html'
     context_object_name = 'posts'
     paginate_by = 5
+    cache_author_header = True
+    # Cold: user lookup, author post count and the page of posts.
+    # With a warm author header only the page of posts is queried.
+    query_budget = 3
+    
+    def get_page_namespaces(self):
+        """User pages only change when this author's posts do"""
+        return [AUTHOR_NAMESPACE % self.kwargs.get('username')]
+    
+    @cached_property
+    def author_header(self):
+        """(profile_user, post_count) for the requested username"""
+        username = self.kwargs.get('username')
+        if self.cache_author_header:
+            return get_author_header(username)
+        user = load_author(username)
+        return user, get_author_post_count(user.pk)
     
     def get_queryset(self):
         """Get posts for the specific user"""
-        user = get_object_or_404(User, username=self.kwargs.get('username'))
-        return Post.objects.filter(author=user).order_by('-published_date')
+        profile_user, _ = self.author_header
+        return Post.objects.by_author(profile_user.pk)
     
     def get_context_data(self, **kwargs):
-        """Add user to context"""
+        """Add user and their post count to context"""
         context = super().get_context_data(**kwargs)
-        context['profile_user'] = get_object_or_404(User, username=self.kwargs.get('username'))
+        context['profile_user'], context['author_post_count'] = self.author_header
         return context
 
-class PostDetailView(DetailView):
+class PostDetailView(CachedPageMixin, QueryBudgetMixin, DetailView):
     """
     Display a single blog post in full detail.
     Accessible to all users.
+    The post, its author and its previous/next posts are fetched in one
+    query; neighbours are then served from the cached neighbour map
+    (when the cache is shared, see blog.navigation).
     """
     model = Post
     template_name = 'blog/post_detail.html'
+    query_budget = 1
+    
+    def get_queryset(self):
+        """Load the author alongside the post"""
+        return super().get_queryset().select_related('author')
+    
+    def get_object(self, queryset=None):
+        """Fetch the post and attach its previous/next posts"""
+        neighbours = get_cached_neighbours(self.kwargs.get(self.pk_url_kwarg))
+        if neighbours is None:
+            post = super().get_object(with_neighbours(self.get_queryset()))
+            neighbours = cache_neighbours(post)
+        else:
+            post = super().get_object(queryset)
+        post.previous_post, post.next_post = as_posts(neighbours)
+        return post
     
     def get_context_data(self, **kwargs):
-        """Add additional context for the post detail view"""
+        """Add previous and next posts for navigation"""
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        
-        # Get previous and next posts for navigation
-        context['previous_post'] = Post.objects.filter(
-            published_date__lt=post.published_date
-        ).order_by('-published_date').first()
-        
-        context['next_post'] = Post.objects.filter(
-            published_date__gt=post.published_date
-        ).order_by('published_date').first()
-        
+        context['previous_post'] = self.object.previous_post
+        context['next_post'] = self.object.next_post
         return context
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -162,4 +203,27 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         )
         return super().delete(request, *args, **kwargs)
 
-# ... (keep existing profile and registration views) ...
\ No newline at end of file
+def register(request):
+    """Sign-up page; new users then log in through the login page."""
+    if request.method == 'POST':
+        form = CustomUserCreationForm(request.POST)
+        if form.is_valid():
+            user = form.save()
+            messages.success(request, f'Account created for {user.username}! You can now log in.')
+            return redirect('login')
+    else:
+        form = CustomUserCreationForm()
+    return render(request, 'blog/register.html', {'form': form})
+
+@login_required
+def profile(request):
+    """Let the logged-in user update their username and email."""
+    if request.method == 'POST':
+        u_form = UserUpdateForm(request.POST, instance=request.user)
+        if u_form.is_valid():
+            u_form.save()
+            messages.success(request, 'Your profile has been updated!')
+            return redirect('profile')
+    else:
+        u_form = UserUpdateForm(instance=request.user)
+    return render(request, 'blog/profile.html', {'u_form': u_form})
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django_blog',
+    'blog',
 ]
 
 MIDDLEWARE = [
@@ -55,7 +56,7 @@ ROOT_URLCONF = 'django_blog.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -136,4 +137,17 @@ LOGOUT_REDIRECT_URL = '/' # Redirect to the homepage after logout
 LOGIN_URL = '/login/' # Used by the @login_required decorator
 
 # Add this line to settings.py
-STATIC_ROOT = BASE_DIR / "staticfiles"
\ No newline at end of file
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Post search backend (dotted path). Leave as None to pick one from the
+# database vendor: SQLite FTS5, Postgres tsvector, or a plain icontains scan.
+BLOG_SEARCH_BACKEND = None
+
+# No CACHES: the default is a per-process LocMemCache, with which the page
+# cache, neighbour map, author headers and post counters stay off (see
+# blog.versioning.is_shared). Deploy with a cache shared by every worker
+# (Redis, Memcached) to enable them.
+
+# Seconds anonymous post list/detail/user pages stay in the page cache.
+# Post writes invalidate them straight away (see blog/page_cache.py).
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
\ No newline at end of file
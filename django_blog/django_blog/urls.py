@@ -1,58 +1,18 @@
 """
 URL configuration for django_blog project.
 
-The `urlpatterns` list routes URLs to views. For more information please see:
-    https://docs.djangoproject.com/en/5.2/topics/http/urls/
-Examples:
-Function views
-    1. Add an import:  from my_app import views
-    2. Add a URL to urlpatterns:  path('', views.home, name='home')
-Class-based views
-    1. Add an import:  from other_app.views import Home
-    2. Add a URL to urlpatterns:  path('', Home.as_view(), name='home')
-Including another URLconf
-    1. Import the include() function: from django.urls import include, path
-    2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
+The blog app serves the site root; see blog/urls.py for its routes.
 """
 from django.contrib import admin
-from django.urls import path
-
-urlpatterns = [
-    path('admin/', admin.site.urls),
-]
-from django.contrib import admin
 from django.urls import path, include
-from django.contrib.auth import views as auth_views
 from django.conf import settings
 from django.conf.urls.static import static
-from blog import views as blog_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', blog_views.home, name='home'),
-    
-    # Authentication URLs
-    path('register/', blog_views.register, name='register'),
-    path('login/', auth_views.LoginView.as_view(
-        template_name='registration/login.html',
-        redirect_authenticated_user=True
-    ), name='login'),
-    path('logout/', auth_views.LogoutView.as_view(
-        template_name='registration/logout.html'
-    ), name='logout'),
-    
-    # Profile URLs
-    path('profile/', blog_views.profile, name='profile'),
-    path('user/<str:username>/', blog_views.user_posts, name='user-posts'),
-    
-    # Post URLs
-    path('post/<int:pk>/', blog_views.PostDetailView.as_view(), name='post-detail'),
-    path('post/new/', blog_views.PostCreateView.as_view(), name='post-create'),
-    path('post/<int:pk>/update/', blog_views.PostUpdateView.as_view(), name='post-update'),
-    path('post/<int:pk>/delete/', blog_views.PostDeleteView.as_view(), name='post-delete'),
+    path('', include('blog.urls')),
 ]
 
-# Serve static and media files during development
+# Serve static files during development
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file